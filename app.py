@@ -1,7 +1,10 @@
-from flask import Flask, render_template_string
+from flask import Flask, Response, render_template_string
 import pandas as pd
 from datetime import datetime
 from odds_arbitrage_finder import OddsArbitrageFinder
+from betslip import BetslipURLGenerator
+from dashboard_snapshot import SnapshotRefresher
+from instrumentation import metrics
 import os
 from dotenv import load_dotenv
 
@@ -16,56 +19,7 @@ class URLGenerator:
         Parse an existing betslip URL to extract book and parameters
         Returns tuple of (book_name, params_dict)
         """
-        if not url:
-            return None, {}
-            
-        url = url.lower()
-        params = {}
-        
-        if 'betrivers.com' in url:
-            parts = url.split('#event/')
-            if len(parts) > 1:
-                event_id = parts[1].split('?')[0]
-                params['event_id'] = event_id
-                if 'market=' in url and 'outcome=' in url:
-                    params['market_id'] = url.split('market=')[1].split('&')[0]
-                    params['outcome_id'] = url.split('outcome=')[1].split('&')[0]
-            return 'betrivers', params
-            
-        elif 'fanduel.com' in url:
-            if '/selection/' in url:
-                selection_parts = url.split('/selection/')[1].split('?')[0].split('-')
-                if len(selection_parts) > 1:
-                    params['event_id'] = selection_parts[0]
-                    params['market_id'] = selection_parts[1]
-                if 'btag=' in url:
-                    params['outcome_id'] = url.split('btag=')[1].split('&')[0]
-            return 'fanduel', params
-            
-        elif 'betmgm.com' in url:
-            if '/event/' in url:
-                params['event_id'] = url.split('/event/')[1].split('?')[0]
-                if 'market=' in url and 'selection=' in url:
-                    params['market_id'] = url.split('market=')[1].split('&')[0]
-                    params['outcome_id'] = url.split('selection=')[1].split('&')[0]
-            return 'betmgm', params
-            
-        elif 'caesars.com' in url:
-            if 'id=' in url and 'market=' in url and 'selection=' in url:
-                params['event_id'] = url.split('id=')[1].split('&')[0]
-                params['market_id'] = url.split('market=')[1].split('&')[0]
-                params['outcome_id'] = url.split('selection=')[1].split('&')[0]
-            return 'caesars', params
-            
-        elif 'draftkings.com' in url:
-            if '/event/' in url:
-                params['event_id'] = url.split('/event/')[1].split('?')[0]
-                if 'category=' in url and 'subcategory=' in url:
-                    params['market_id'] = url.split('category=')[1].split('&')[0]
-                    params['outcome_id'] = url.split('subcategory=')[1].split('&')[0]
-            return 'draftkings', params
-            
-        return None, {}
+        return BetslipURLGenerator.parse_existing_url(url)
     
     def generate_betrivers_url(self, market_id, selection_id, state):
         return f"https://betrivers.com/{state}/..."
@@ -296,31 +250,78 @@ class OpportunitiesGenerator:
         }
         return book_logos.get(bookmaker.lower(), '/static/images/default-logo.png')
 
+# One finder for every scan, so its polling schedule, quota planner and
+# the odds it last fetched carry over from scan to scan
+arbitrage_finder = None
+
 # Assume you have a function to get the opportunities data
 def get_data():
-    api_key = os.getenv('ODDS_API_KEY')
+    global arbitrage_finder
+    if arbitrage_finder is None:
+        arbitrage_finder = OddsArbitrageFinder(os.getenv('ODDS_API_KEY'))
     
-    arbitrage_finder = OddsArbitrageFinder(api_key)
     arbitrage_table = arbitrage_finder.generate_arbitrage_table()
     return arbitrage_table, arbitrage_finder.all_plus_ev
 
 
+# Scans run in the background; requests render the latest completed snapshot.
+# Requests arriving mid-scan share that scan, and a snapshot older than
+# REFRESH_TTL is served as-is while a single refresh replaces it. Scans are
+# cheap when little is due, so they run every minute and the finder's
+# scheduler decides what each one refetches.
+refresher = SnapshotRefresher(
+    get_data,
+    interval=int(os.getenv('REFRESH_INTERVAL', 60)),
+    ttl=int(os.getenv('REFRESH_TTL', 60))
+)
+
+# How long a request waits for the very first scan before rendering an empty page
+FIRST_SCAN_WAIT = float(os.getenv('FIRST_SCAN_WAIT', 30))
+
 # Initialize the opportunities generator
 opportunities_generator = OpportunitiesGenerator()
 
+# Card HTML for the latest snapshot, rendered once per snapshot
+rendered_cards = {'created_at': None, 'html': None}
+
+def get_snapshot_cards(snapshot):
+    """Return (arbitrage cards, +EV cards) HTML for a snapshot"""
+    if snapshot is None:
+        return (opportunities_generator.generate_arbitrage_cards(pd.DataFrame()),
+                opportunities_generator.generate_plus_ev_cards([]))
+    
+    if rendered_cards['created_at'] != snapshot.created_at:
+        with metrics.span('generate_arbitrage_cards'):
+            arb_cards_html = opportunities_generator.generate_arbitrage_cards(snapshot.arbitrage_table)
+        with metrics.span('generate_plus_ev_cards'):
+            plus_ev_cards_html = opportunities_generator.generate_plus_ev_cards(list(snapshot.plus_ev))
+        rendered_cards['html'] = (arb_cards_html, plus_ev_cards_html)
+        rendered_cards['created_at'] = snapshot.created_at
+    return rendered_cards['html']
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Stage timings, last cycle breakdown and counters in Prometheus text format"""
+    snapshot = refresher.snapshot
+    if snapshot is not None:
+        metrics.set_gauge('odds_snapshot_age_seconds', round(snapshot.age(), 3), 'Age of the snapshot the dashboard serves')
+        metrics.set_gauge('odds_snapshot_scan_seconds', round(snapshot.duration, 3), 'Duration of the scan behind the served snapshot')
+    return Response(metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/')
 def index():
-    # Get the data
-    arbitrage_table, plus_ev_data = get_data()
-    
-    # Initialize generator
-    opportunities_generator = OpportunitiesGenerator()
+    # Render from the latest snapshot; scanning happens on the refresher thread
+    snapshot = refresher.get(timeout=FIRST_SCAN_WAIT)
+    snapshot_age = f"Updated {snapshot.age_display()}" if snapshot is not None else "First scan in progress"
     
     # Generate HTML components
-    arb_cards_html = opportunities_generator.generate_arbitrage_cards(arbitrage_table)
-    plus_ev_cards_html = opportunities_generator.generate_plus_ev_cards(plus_ev_data)
+    arb_cards_html, plus_ev_cards_html = get_snapshot_cards(snapshot)
     bookmaker_filter_html = opportunities_generator.generate_bookmaker_filter()
     
+    with metrics.span('render_page'):
+        return render_index(arb_cards_html, plus_ev_cards_html, bookmaker_filter_html, snapshot_age)
+
+def render_index(arb_cards_html, plus_ev_cards_html, bookmaker_filter_html, snapshot_age):
     return render_template_string("""
         <!DOCTYPE html>
         <html>
@@ -790,6 +791,7 @@ def index():
             <div class="container">
                 <div style="display: flex; justify-content: space-between; align-items: center; margin-bottom: 16px;">
                     <h1 style="color: var(--text-primary); margin: 0; ">IcyPicks</h1>
+                    <span id="snapshotAge" style="color: var(--text-secondary); font-size: 14px;">{{ snapshot_age }}</span>
                     <button id="refreshButton" class="refresh-button">
                         <span class="refresh-icon">↻</span>
                         Refresh
@@ -901,6 +903,11 @@ def index():
                                 document.querySelector('#plus-ev').innerHTML = evContent.innerHTML;
                             }
                             
+                            const ageContent = doc.querySelector('#snapshotAge');
+                            if (ageContent) {
+                                document.querySelector('#snapshotAge').textContent = ageContent.textContent;
+                            }
+                            
                             const filterEvent = new Event('change');
                             document.querySelector('.book-filter').dispatchEvent(filterEvent);
                             
@@ -1030,8 +1037,10 @@ def index():
             </script>
         </body>
         </html>
-    """, arb_cards_html=arb_cards_html, plus_ev_cards_html=plus_ev_cards_html, bookmaker_filter_html=bookmaker_filter_html)
+    """, arb_cards_html=arb_cards_html, plus_ev_cards_html=plus_ev_cards_html, bookmaker_filter_html=bookmaker_filter_html,
+        snapshot_age=snapshot_age)
 
 if __name__ == '__main__':
+    refresher.start()
     port = int(os.environ.get('PORT', 5000))
     app.run(host='0.0.0.0', port=port)
\ No newline at end of file
@@ -0,0 +1,155 @@
+"""
+Micro-benchmark betslip link parsing on a corpus of real link shapes.
+
+Compares the split-chain parser parse_existing_url used to run (kept here
+as legacy_parse) with the shared parse_betslip_url, uncached
+and through BetslipURLGenerator's cache one link at a time and in batches,
+and checks both parsers agree on every link.
+
+Usage: python benchmarks/bench_betslip.py [--links 20000] [--distinct 2000] [--repeat 5] [--seed 0]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from betslip import BetslipURLGenerator, parse_betslip_url
+
+
+# Betslip links as the generators and the Odds API (includeLinks) shape them, mixed case included
+LINK_SHAPES = [
+    "https://{state}.betrivers.com/?page=sportsbook#event/{event}?betsource=direct&market={market}&outcome={outcome}",
+    "https://{state}.betrivers.com/?page=sportsbook#event/{event}",
+    "https://sportsbook.fanduel.com/{state}/selection/{event}-{market}?btag={outcome}",
+    "https://sportsbook.fanduel.com/addToBetslip?marketId[0]={market}&selectionId[0]={outcome}",
+    "https://sports.{state}.betmgm.com/en/sports/event/{event}?market={market}&selection={outcome}",
+    "https://sports.{state}.betmgm.com/en/sports/events/{event}?options={event}-{market}--{outcome}",
+    "https://sportsbook.caesars.com/us/{state}/bet?id={event}&market={market}&selection={outcome}",
+    "https://sportsbook.caesars.com/us/{state}/bet/betslip?selectionIds={outcome}",
+    "https://sportsbook.draftkings.com/{state}/event/{event}?category={market}&subcategory={outcome}",
+    "https://sportsbook.draftkings.com/event/{event}?outcomes=0ML{market}_{outcome}",
+    "https://www.pinnacle.com/en/basketball/nba/matchups/#{event}",
+    ""
+]
+
+
+def legacy_parse(url):
+    """parse_existing_url before it moved to betslip.py"""
+    if not url:
+        return None, {}
+
+    url = url.lower()
+    params = {}
+
+    if 'betrivers.com' in url:
+        parts = url.split('#event/')
+        if len(parts) > 1:
+            event_id = parts[1].split('?')[0]
+            params['event_id'] = event_id
+            if 'market=' in url and 'outcome=' in url:
+                params['market_id'] = url.split('market=')[1].split('&')[0]
+                params['outcome_id'] = url.split('outcome=')[1].split('&')[0]
+        return 'betrivers', params
+
+    elif 'fanduel.com' in url:
+        if '/selection/' in url:
+            selection_parts = url.split('/selection/')[1].split('?')[0].split('-')
+            if len(selection_parts) > 1:
+                params['event_id'] = selection_parts[0]
+                params['market_id'] = selection_parts[1]
+            if 'btag=' in url:
+                params['outcome_id'] = url.split('btag=')[1].split('&')[0]
+        return 'fanduel', params
+
+    elif 'betmgm.com' in url:
+        if '/event/' in url:
+            params['event_id'] = url.split('/event/')[1].split('?')[0]
+            if 'market=' in url and 'selection=' in url:
+                params['market_id'] = url.split('market=')[1].split('&')[0]
+                params['outcome_id'] = url.split('selection=')[1].split('&')[0]
+        return 'betmgm', params
+
+    elif 'caesars.com' in url:
+        if 'id=' in url and 'market=' in url and 'selection=' in url:
+            params['event_id'] = url.split('id=')[1].split('&')[0]
+            params['market_id'] = url.split('market=')[1].split('&')[0]
+            params['outcome_id'] = url.split('selection=')[1].split('&')[0]
+        return 'caesars', params
+
+    elif 'draftkings.com' in url:
+        if '/event/' in url:
+            params['event_id'] = url.split('/event/')[1].split('?')[0]
+            if 'category=' in url and 'subcategory=' in url:
+                params['market_id'] = url.split('category=')[1].split('&')[0]
+                params['outcome_id'] = url.split('subcategory=')[1].split('&')[0]
+        return 'draftkings', params
+
+    return None, {}
+
+
+def build_corpus(size, distinct, seed=0):
+    """size links drawn from distinct ones of LINK_SHAPES; rendered rows repeat links the same way"""
+    rng = random.Random(seed)
+    states = ['md', 'nj', 'ny', 'pa', 'IL', 'Az']
+    pool = [
+        rng.choice(LINK_SHAPES).format(state=rng.choice(states), event=rng.randrange(10 ** 9),
+                                       market=f"{rng.randrange(10 ** 3)}.{rng.randrange(10 ** 9)}",
+                                       outcome=rng.randrange(10 ** 10))
+        for _ in range(distinct)
+    ]
+    return [rng.choice(pool) for _ in range(size)]
+
+
+def best_of(func, repeat=5):
+    """Run func repeat times; return (fastest wall time, last result)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--links', type=int, default=20000)
+    parser.add_argument('--distinct', type=int, default=2000, help='distinct links the corpus draws from')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    links = build_corpus(args.links, args.distinct, args.seed)
+    legacy = [legacy_parse(link) for link in links]
+    assert legacy == [parse_betslip_url(link) for link in links], "parse_betslip_url differs from the legacy parser"
+    cache = BetslipURLGenerator.parse_cache
+
+    def cached_cold(parse):
+        def run():
+            cache.clear()
+            return parse()
+        return run
+
+    cases = [
+        ('legacy split chains', lambda: [legacy_parse(link) for link in links]),
+        ('parse_betslip_url', lambda: [parse_betslip_url(link) for link in links]),
+        ('parse_existing_url cold', cached_cold(lambda: [BetslipURLGenerator.parse_existing_url(link) for link in links])),
+        ('parse_urls cold', cached_cold(lambda: BetslipURLGenerator.parse_urls(links))),
+        ('parse_existing_url warm', lambda: [BetslipURLGenerator.parse_existing_url(link) for link in links]),
+        ('parse_urls warm', lambda: BetslipURLGenerator.parse_urls(links))
+    ]
+
+    print(f"{len(links)} links, {len(set(links))} distinct, cache holds {cache.max_size}")
+    print(f"  {'parser':<28}{'best ms':>10}{'links/s':>12}{'vs legacy':>11}")
+    baseline = None
+    for name, func in cases:
+        elapsed, result = best_of(func, args.repeat)
+        assert result == legacy, f"{name} differs from the legacy parser"
+        baseline = baseline or elapsed
+        print(f"  {name:<28}{elapsed * 1000:>10.1f}{len(links) / elapsed:>12.0f}{baseline / elapsed:>10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Benchmark the per-game find_opportunities loops against the vectorized detector.
+
+Usage: python benchmarks/bench_detection.py [games] [alternate_lines] [players] [low_hold_threshold]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from odds_arbitrage_finder import OddsArbitrageFinder
+from detection_engine import VectorizedDetector
+from synthetic_odds import SyntheticOddsGenerator, count_quotes
+
+
+def best_of(func, repeat=5):
+    """Run func repeat times; return (fastest wall time, last result)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def main():
+    n_games = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    alternate_lines = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    players = int(sys.argv[3]) if len(sys.argv) > 3 else 5
+    low_hold_threshold = float(sys.argv[4]) if len(sys.argv) > 4 else None
+
+    generator = SyntheticOddsGenerator({'basketball_nba': n_games}, alternate_lines=alternate_lines, players=players, seed=42)
+    slate = generator.slate()
+    games = [(game, additional_odds, props) for _, game, additional_odds, props in slate]
+    os.environ['ODDS_API_CACHE'] = ''  # Offline runs need no persistent response cache
+    finder = OddsArbitrageFinder(api_key=None)
+    if low_hold_threshold is not None:
+        finder.low_hold_threshold = low_hold_threshold
+    detector = VectorizedDetector(finder)
+
+    def run_loops():
+        return [
+            finder.find_opportunities(dict(game, bookmakers=list(game['bookmakers'])), additional_odds, player_props=props)
+            for game, additional_odds, props in games
+        ]
+
+    loop_time, loop_results = best_of(run_loops)
+    vectorized_time, vectorized_results = best_of(lambda: detector.find_opportunities(games))
+
+    assert loop_results == vectorized_results, "Vectorized detector output differs from find_opportunities"
+
+    opportunities = sum(len(result) for result in loop_results)
+    print(f"{n_games} games, {count_quotes(slate)} quotes, {opportunities} opportunities")
+    print(f"find_opportunities loops: {loop_time * 1000:.1f} ms")
+    print(f"VectorizedDetector:       {vectorized_time * 1000:.1f} ms")
+    print(f"Speedup:                  {loop_time / vectorized_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,223 @@
+"""
+Offline benchmarks for the scan pipeline on synthetic Odds API slates.
+
+Reports wall time, throughput, and peak and retained traced memory (what
+the returned result still holds, e.g. the quote index) for process_markets,
+power_devig, find_opportunities, find_plus_ev_bets and the HTML generators
+at several slate sizes. IncrementalDetector is timed from scratch, on an
+unchanged slate, and after --moved of the bookmaker-markets changed price.
+MultiwayDetector is timed on outright (futures) markets with --outcomes
+outcomes at every US book, and MiddleDetector on the slate's spreads,
+totals and props with their alternate lines.
+
+Usage: python benchmarks/bench_pipeline.py [--slates nhl_night full_saturday]
+           [--alternate-lines 8] [--players 6] [--moved 0.05] [--outcomes 30] [--repeat 3] [--seed 0]
+"""
+import os
+import sys
+import io
+import time
+import copy
+import random
+import argparse
+import logging
+import tracemalloc
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from odds_arbitrage_finder import OddsArbitrageFinder
+from devig import power_devig, power_devig_batch
+from detection_engine import GameQuoteIndex, VectorizedDetector
+from synthetic_odds import SyntheticOddsGenerator, SLATES, count_quotes
+
+
+def best_of(func, repeat=3):
+    """Run func repeat times; return (fastest wall time, last result)"""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def peak_memory(func):
+    """(peak bytes allocated while func runs, bytes its result still holds)"""
+    tracemalloc.start()
+    try:
+        result = func()
+        retained, peak = tracemalloc.get_traced_memory()
+        del result
+        return peak, retained
+    finally:
+        tracemalloc.stop()
+
+
+def prop_price_pairs(finder, slate):
+    """American (over, under) price pairs from every Pinnacle prop, the inputs +EV devigs"""
+    pairs = []
+    for _, game, additional_odds, player_props in slate:
+        for bookmaker in player_props:
+            if bookmaker['title'] != 'Pinnacle':
+                continue
+            for market in bookmaker['markets']:
+                outcomes = market['outcomes']
+                for over, under in zip(outcomes[::2], outcomes[1::2]):
+                    pairs.append([finder.decimal_to_american(over['price']), finder.decimal_to_american(under['price'])])
+    return pairs
+
+
+def fresh_games(slate):
+    # Every run gets its own bookmaker lists, as each scan cycle does
+    return [(dict(game, bookmakers=list(game['bookmakers'])), additional_odds, props)
+            for _, game, additional_odds, props in slate]
+
+
+def move_lines(slate, fraction, seed=0):
+    """Copy of a slate where roughly fraction of the bookmaker-markets moved their prices"""
+    rng = random.Random(seed)
+    slate = copy.deepcopy(slate)
+    for _, game, additional_odds, props in slate:
+        for bookmaker in game['bookmakers'] + additional_odds + props:
+            for market in bookmaker['markets']:
+                if rng.random() < fraction:
+                    for outcome in market['outcomes']:
+                        outcome['price'] = round(outcome['price'] * rng.uniform(0.97, 1.03), 3)
+    return slate
+
+
+def outright_games(finder, count, outcomes, seed=0):
+    """count futures events with outcomes runners priced at every US book, as detection input"""
+    rng = random.Random(seed)
+    games = []
+    for number in range(count):
+        fair = [rng.uniform(1, 20) for _ in range(outcomes)]
+        total = sum(fair)
+        bookmakers = [
+            {'title': book, 'markets': [{'key': 'outrights', 'outcomes': [
+                {'name': f"Team {runner}", 'price': round(total / (weight * rng.uniform(1.05, 1.25)), 2)}
+                for runner, weight in enumerate(fair)
+            ]}]}
+            for book in finder.regions['us']
+        ]
+        games.append(({'id': f"outright-{number}", 'sport_key': 'basketball_nba_championship_winner',
+                       'sport_title': 'NBA Championship Winner', 'home_team': None, 'away_team': None,
+                       'commence_time': '2030-06-01T00:00:00Z', 'bookmakers': bookmakers}, [], []))
+    return games
+
+
+def build_cases(finder, cards, slate, moved=0.05, outcomes=30):
+    """(name, unit, units, func) for every benchmarked function"""
+    pairs = prop_price_pairs(finder, slate)
+    games = [game for _, game, _, _ in slate]
+    market_quotes = sum(
+        len(market['outcomes'])
+        for _, game, additional_odds, _ in slate
+        for bookmaker in game['bookmakers'] + additional_odds
+        for market in bookmaker['markets']
+    )
+
+    def run_index():
+        return [GameQuoteIndex(game, additional_odds, props) for game, additional_odds, props in fresh_games(slate)]
+
+    def run_process_markets():
+        for _, game, additional_odds, _ in slate:
+            bookmakers = game['bookmakers'] + additional_odds
+            for market_type in finder.featured_markets + finder.additional_markets:
+                finder.process_markets(bookmakers, market_type)
+
+    def run_loops():
+        return [finder.find_opportunities(game, additional_odds, player_props=props)
+                for game, additional_odds, props in fresh_games(slate)]
+
+    def run_plus_ev():
+        return [bet for game in games for bet in finder.find_plus_ev_bets(game)]
+
+    # Incremental runs start from the results of a detection over the unmoved slate
+    finder.incremental.detect(fresh_games(slate))
+    primed = finder.incremental.results
+    moved_slate = move_lines(slate, moved)
+
+    def run_incremental(target, results):
+        # Scans hand detection the indexes they already built for every consumer (timed as GameQuoteIndex)
+        target_games = fresh_games(target)
+        indexes = [GameQuoteIndex(*game) for game in target_games]
+
+        def run():
+            finder.incremental.results = results
+            return finder.incremental.detect(target_games, indexes)
+        return run
+
+    futures = outright_games(finder, len(slate), outcomes)
+    futures_quotes = sum(len(market['outcomes']) for game, _, _ in futures
+                         for bookmaker in game['bookmakers'] for market in bookmaker['markets'])
+
+    detector = VectorizedDetector(finder)
+    opportunities = [opp for opps in finder.unified.detect(fresh_games(slate))[0] for opp in opps]
+    table = finder.build_arbitrage_table(opportunities)
+    plus_ev = run_plus_ev()
+
+    return [
+        ('process_markets', 'quotes', market_quotes, run_process_markets),
+        ('GameQuoteIndex', 'quotes', count_quotes(slate), run_index),
+        ('power_devig', 'pairs', len(pairs), lambda: [power_devig(pair) for pair in pairs]),
+        ('power_devig_batch', 'pairs', len(pairs), lambda: power_devig_batch(pairs) if pairs else None),
+        ('find_opportunities', 'games', len(slate), run_loops),
+        ('VectorizedDetector', 'games', len(slate), lambda: detector.find_opportunities(fresh_games(slate))),
+        ('find_plus_ev_bets', 'games', len(slate), run_plus_ev),
+        ('UnifiedDetector', 'games', len(slate), lambda: finder.unified.detect(fresh_games(slate))),
+        ('IncrementalDetector cold', 'games', len(slate), run_incremental(slate, {})),
+        ('IncrementalDetector warm', 'games', len(slate), run_incremental(slate, primed)),
+        (f'IncrementalDetector {moved:.0%} moved', 'games', len(slate), run_incremental(moved_slate, primed)),
+        ('MultiwayDetector outrights', 'quotes', futures_quotes, lambda: finder.multiway.find_opportunities(futures)),
+        ('MiddleDetector', 'games', len(slate), lambda: finder.middle_finder.find_middles(fresh_games(slate))),
+        ('generate_html', 'rows', len(table), lambda: finder.generate_html(table.copy())),
+        ('generate_arbitrage_cards', 'rows', len(table), lambda: cards.generate_arbitrage_cards(table.copy())),
+        ('generate_plus_ev_cards', 'bets', len(plus_ev), lambda: cards.generate_plus_ev_cards(list(plus_ev)))
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--slates', nargs='+', default=list(SLATES), choices=list(SLATES))
+    parser.add_argument('--alternate-lines', type=int, default=8, help='alternate lines per side per book')
+    parser.add_argument('--players', type=int, default=6, help='players per team with props')
+    parser.add_argument('--moved', type=float, default=0.05, help='share of bookmaker-markets moved between incremental runs')
+    parser.add_argument('--outcomes', type=int, default=30, help='outcomes per outright market')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    # Card generators live on the dashboard; app.py only builds its refresher on import
+    from app import OpportunitiesGenerator
+    cards = OpportunitiesGenerator()
+
+    os.environ['ODDS_API_CACHE'] = ''  # Offline runs need no persistent response cache
+    finder = OddsArbitrageFinder(api_key=None)
+    finder.metrics.enabled = False
+    logging.disable(logging.INFO)  # +EV search logs every bet it finds
+
+    for name in args.slates:
+        generator = SyntheticOddsGenerator(SLATES[name], alternate_lines=args.alternate_lines,
+                                           players=args.players, seed=args.seed)
+        slate = generator.slate()
+        finder.all_player_props = {game['id']: {'props': props, 'game': game} for _, game, _, props in slate if props}
+
+        print(f"\n{name}: {len(slate)} events, {count_quotes(slate)} quotes "
+              f"({', '.join(f'{sport} {count}' for sport, count in SLATES[name].items())})")
+        print(f"  {'function':<30}{'units':>14}{'best ms':>11}{'units/s':>12}{'peak MiB':>10}{'kept MiB':>10}")
+
+        with redirect_stdout(io.StringIO()):
+            cases = build_cases(finder, cards, slate, args.moved, args.outcomes)
+
+        for function, unit, units, func in cases:
+            with redirect_stdout(io.StringIO()):
+                elapsed, _ = best_of(func, args.repeat)
+                peak, retained = peak_memory(func)
+            throughput = units / elapsed if elapsed else float('inf')
+            print(f"  {function:<30}{f'{units} {unit}':>14}{elapsed * 1000:>11.1f}{throughput:>12.0f}{peak / 2 ** 20:>10.1f}{retained / 2 ** 20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
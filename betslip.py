@@ -1,7 +1,139 @@
+import threading
+from collections import OrderedDict
+
+
+def parse_betslip_url(url):
+    """
+    (book_name, params) for a betslip link. The book is the first known domain
+    found in the lowercased link; links matching none give (None, {}). Splits
+    are bounded (maxsplit 2 keeps the text between the first and second
+    marker) so long links are not split whole.
+    """
+    if not url:
+        return None, {}
+    url = url.lower()
+    params = {}
+    if 'betrivers.com' in url:
+        if '#event/' in url:
+            params['event_id'] = url.split('#event/', 2)[1].split('?', 1)[0]
+            if 'market=' in url and 'outcome=' in url:
+                params['market_id'] = url.split('market=', 2)[1].split('&', 1)[0]
+                params['outcome_id'] = url.split('outcome=', 2)[1].split('&', 1)[0]
+        return 'betrivers', params
+    if 'fanduel.com' in url:
+        if '/selection/' in url:
+            selection_parts = url.split('/selection/', 2)[1].split('?', 1)[0].split('-', 2)
+            if len(selection_parts) > 1:
+                params['event_id'] = selection_parts[0]
+                params['market_id'] = selection_parts[1]
+            if 'btag=' in url:
+                params['outcome_id'] = url.split('btag=', 2)[1].split('&', 1)[0]
+        return 'fanduel', params
+    if 'betmgm.com' in url:
+        if '/event/' in url:
+            params['event_id'] = url.split('/event/', 2)[1].split('?', 1)[0]
+            if 'market=' in url and 'selection=' in url:
+                params['market_id'] = url.split('market=', 2)[1].split('&', 1)[0]
+                params['outcome_id'] = url.split('selection=', 2)[1].split('&', 1)[0]
+        return 'betmgm', params
+    if 'caesars.com' in url:
+        if 'id=' in url and 'market=' in url and 'selection=' in url:
+            params['event_id'] = url.split('id=', 2)[1].split('&', 1)[0]
+            params['market_id'] = url.split('market=', 2)[1].split('&', 1)[0]
+            params['outcome_id'] = url.split('selection=', 2)[1].split('&', 1)[0]
+        return 'caesars', params
+    if 'draftkings.com' in url:
+        if '/event/' in url:
+            params['event_id'] = url.split('/event/', 2)[1].split('?', 1)[0]
+            if 'category=' in url and 'subcategory=' in url:
+                params['market_id'] = url.split('category=', 2)[1].split('&', 1)[0]
+                params['outcome_id'] = url.split('subcategory=', 2)[1].split('&', 1)[0]
+        return 'draftkings', params
+    return None, {}
+
+
+class ParseCache:
+    """
+    Bounded LRU cache of parsed betslip links.
+
+    Links are parsed lazily, when a record is rendered, and the same links
+    surface cycle after cycle, so each one is parsed once until it falls out
+    of the cache. Parses, hits and evictions are counted per cycle (since the
+    last start_cycle()) and since the cache was created.
+    """
+    def __init__(self, max_size=4096):
+        self.max_size = max_size
+        self.lock = threading.Lock()
+        self.entries = OrderedDict()
+        self.counts = {'parses': 0, 'hits': 0, 'evictions': 0}
+        self.cycle_start = dict(self.counts)
+
+    def start_cycle(self):
+        with self.lock:
+            self.cycle_start = dict(self.counts)
+
+    def get_stats(self, cycle=True):
+        """Counters for the current cycle (or since creation) with the hit rate"""
+        with self.lock:
+            stats = {name: count - (self.cycle_start[name] if cycle else 0) for name, count in self.counts.items()}
+            stats['size'] = len(self.entries)
+        lookups = stats['hits'] + stats['parses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def get(self, url, parse):
+        """(book_name, params) for url, parsing it with parse on a miss"""
+        with self.lock:
+            result = self.entries.get(url)
+            if result is not None:
+                self.entries.move_to_end(url)
+                self.counts['hits'] += 1
+        if result is None:
+            result = parse(url)
+            with self.lock:
+                self.store(url, result)
+        # Callers get their own params dict so the cached one cannot be altered
+        return result[0], dict(result[1])
+
+    def get_many(self, urls, parse):
+        """get() for a list of links, parsing each distinct missing link once"""
+        urls = list(urls)
+        entries = self.entries
+        found = {}
+        with self.lock:
+            for url in set(urls):
+                result = entries.get(url)
+                if result is not None:
+                    entries.move_to_end(url)
+                    found[url] = result
+        missing = [url for url in dict.fromkeys(urls) if url not in found]
+        parsed = [parse(url) for url in missing]
+        with self.lock:
+            for url, result in zip(missing, parsed):
+                self.store(url, result)
+                found[url] = result
+            self.counts['hits'] += len(urls) - len(missing)
+        return [(found[url][0], dict(found[url][1])) for url in urls]
+
+    def store(self, url, result):
+        """Add a parsed link, evicting the least recently used over max_size; call with the lock held"""
+        self.entries[url] = result
+        self.counts['parses'] += 1
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.counts['evictions'] += 1
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
 class BetslipURLGenerator():
     """
     Utility class to generate betslip URLs for different sportsbooks
     """
+    parse_cache = ParseCache()
+
     @staticmethod
     def generate_betrivers_url(event_id, market_id, outcome_id, state='md'):
         """Generate BetRivers betslip URL"""
@@ -31,55 +163,20 @@ class BetslipURLGenerator():
     def parse_existing_url(cls, url):
         """
         Parse an existing betslip URL to extract book and parameters
-        Returns tuple of (book_name, params_dict)
+        Returns tuple of (book_name, params_dict), memoized in parse_cache
         """
         if not url:
             return None, {}
-            
-        url = url.lower()
-        params = {}
-        
-        if 'betrivers.com' in url:
-            parts = url.split('#event/')
-            if len(parts) > 1:
-                event_id = parts[1].split('?')[0]
-                params['event_id'] = event_id
-                if 'market=' in url and 'outcome=' in url:
-                    params['market_id'] = url.split('market=')[1].split('&')[0]
-                    params['outcome_id'] = url.split('outcome=')[1].split('&')[0]
-            return 'betrivers', params
-            
-        elif 'fanduel.com' in url:
-            if '/selection/' in url:
-                selection_parts = url.split('/selection/')[1].split('?')[0].split('-')
-                if len(selection_parts) > 1:
-                    params['event_id'] = selection_parts[0]
-                    params['market_id'] = selection_parts[1]
-                if 'btag=' in url:
-                    params['outcome_id'] = url.split('btag=')[1].split('&')[0]
-            return 'fanduel', params
-            
-        elif 'betmgm.com' in url:
-            if '/event/' in url:
-                params['event_id'] = url.split('/event/')[1].split('?')[0]
-                if 'market=' in url and 'selection=' in url:
-                    params['market_id'] = url.split('market=')[1].split('&')[0]
-                    params['outcome_id'] = url.split('selection=')[1].split('&')[0]
-            return 'betmgm', params
-            
-        elif 'caesars.com' in url:
-            if 'id=' in url and 'market=' in url and 'selection=' in url:
-                params['event_id'] = url.split('id=')[1].split('&')[0]
-                params['market_id'] = url.split('market=')[1].split('&')[0]
-                params['outcome_id'] = url.split('selection=')[1].split('&')[0]
-            return 'caesars', params
-            
-        elif 'draftkings.com' in url:
-            if '/event/' in url:
-                params['event_id'] = url.split('/event/')[1].split('?')[0]
-                if 'category=' in url and 'subcategory=' in url:
-                    params['market_id'] = url.split('category=')[1].split('&')[0]
-                    params['outcome_id'] = url.split('subcategory=')[1].split('&')[0]
-            return 'draftkings', params
-            
-        return None, {}
\ No newline at end of file
+        return cls.parse_cache.get(url, cls.parse_url)
+
+    @staticmethod
+    def parse_url(url):
+        """Uncached parse_existing_url"""
+        return parse_betslip_url(url)
+
+    @classmethod
+    def parse_urls(cls, urls):
+        """parse_existing_url for a list of links, each distinct link parsed at most once"""
+        urls = list(urls)
+        parsed = iter(cls.parse_cache.get_many([url for url in urls if url], cls.parse_url))
+        return [next(parsed) if url else (None, {}) for url in urls]
@@ -0,0 +1,118 @@
+import time
+import logging
+import threading
+from collections import namedtuple
+from concurrent.futures import Future
+
+
+class DashboardSnapshot(namedtuple('DashboardSnapshot', ['arbitrage_table', 'plus_ev', 'created_at', 'duration'])):
+    """Immutable result of one full scan: arbitrage table, +EV list, when it finished and how long it took"""
+    __slots__ = ()
+
+    def age(self):
+        """Seconds since the snapshot was taken"""
+        return time.time() - self.created_at
+
+    def age_display(self):
+        """Human readable snapshot age"""
+        seconds = int(self.age())
+        if seconds < 60:
+            return f"{seconds}s ago"
+        if seconds < 3600:
+            return f"{seconds // 60}m ago"
+        return f"{seconds // 3600}h {seconds % 3600 // 60}m ago"
+
+
+class SnapshotRefresher:
+    """
+    Keeps the latest DashboardSnapshot for the dashboard.
+    fetch is a callable returning (arbitrage_table, plus_ev); readers only
+    ever see a completed snapshot, never a scan in progress.
+
+    Scans are single-flight: at most one runs at a time and every caller that
+    asks for a refresh while it runs shares its result. Once a snapshot is
+    older than ttl, readers get it immediately while one background scan
+    replaces it (stale-while-revalidate), so scans are capped at one per ttl
+    however much traffic arrives. With an interval, a background loop also
+    refreshes on that schedule; interval=None refreshes only on demand.
+    """
+    def __init__(self, fetch, interval=300, ttl=None):
+        self.fetch = fetch
+        self.interval = interval
+        self.ttl = ttl if ttl is not None else (interval or 300)
+        self.snapshot = None
+        self.thread = None
+        self.inflight = None
+        self.lock = threading.Lock()
+        self.stop_event = threading.Event()
+        self.logger = logging.getLogger('snapshot_refresher')
+
+    def start(self):
+        """Start the refresh loop once; later calls are no-ops"""
+        if self.interval is None:
+            return
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return
+            self.stop_event.clear()
+            self.thread = threading.Thread(target=self.run, name='snapshot-refresher', daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """Ask the refresh loop to exit after the current scan"""
+        self.stop_event.set()
+
+    def refresh(self):
+        """Run one scan and publish it as the latest snapshot"""
+        started = time.time()
+        arbitrage_table, plus_ev = self.fetch()
+        snapshot = DashboardSnapshot(arbitrage_table, tuple(plus_ev), time.time(), time.time() - started)
+        self.snapshot = snapshot
+        return snapshot
+
+    def request_refresh(self):
+        """Start a scan unless one is already running; return the Future of the running scan"""
+        with self.lock:
+            if self.inflight is None:
+                self.inflight = Future()
+                threading.Thread(target=self.run_refresh, args=(self.inflight,), daemon=True).start()
+            return self.inflight
+
+    def run_refresh(self, future):
+        try:
+            snapshot = self.refresh()
+            self.logger.info(f"Snapshot refreshed in {snapshot.duration:.1f}s")
+            future.set_result(snapshot)
+        except Exception as e:
+            self.logger.error(f"Snapshot refresh failed: {e}", exc_info=True)
+            future.set_exception(e)
+        finally:
+            with self.lock:
+                self.inflight = None
+
+    def run(self):
+        while not self.stop_event.is_set():
+            try:
+                self.request_refresh().result()
+            except Exception:
+                pass  # Already logged by run_refresh
+            self.stop_event.wait(self.interval)
+
+    def get(self, timeout=0):
+        """
+        Latest snapshot, triggering a background scan if it is missing or stale.
+        With no snapshot yet, waits up to timeout seconds for the in-flight
+        scan and returns None if it has not finished.
+        """
+        self.start()
+        snapshot = self.snapshot
+        if snapshot is not None and snapshot.age() <= self.ttl:
+            return snapshot
+
+        future = self.request_refresh()
+        if snapshot is None and timeout:
+            try:
+                return future.result(timeout)
+            except Exception:
+                return self.snapshot
+        return snapshot
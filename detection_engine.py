@@ -0,0 +1,1166 @@
+import sys
+import math
+import logging
+from bisect import bisect_right
+import numpy as np
+from devig import power_devig, power_devig_batch
+
+
+def group_codes(*columns):
+    """Dense integer code for each row's combination of column values"""
+    size = len(columns[0])
+    if not size:
+        return np.zeros(0, dtype=np.int64)
+    idx = np.lexsort(columns[::-1])
+    change = np.zeros(size, dtype=bool)
+    change[0] = True
+    for column in columns:
+        sorted_column = column[idx]
+        change[1:] |= sorted_column[1:] != sorted_column[:-1]
+    codes = np.empty(size, dtype=np.int64)
+    codes[idx] = np.cumsum(change) - 1
+    return codes
+
+
+def first_appearance(codes, order):
+    """Smallest traversal order seen for each code, indexed by code"""
+    first = np.full(codes.max() + 1 if len(codes) else 0, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(first, codes, order)
+    return first
+
+
+def best_quotes(key, price, order):
+    """
+    Pick the best-priced quote for every key (earliest quote wins ties).
+    Returns (row index of each best quote, first traversal order of each key).
+    """
+    idx = np.lexsort((order, -price, key))
+    sorted_key = key[idx]
+    starts = np.flatnonzero(np.r_[True, sorted_key[1:] != sorted_key[:-1]])
+    return idx[starts], np.minimum.reduceat(order[idx], starts)
+
+
+def bucket_pairs(bucket):
+    """
+    All position pairs (i, j) with i < j that share a bucket.
+    Rows must already be sorted by bucket, so pairs are at most bucket-size apart.
+    """
+    firsts = []
+    seconds = []
+    distance = 1
+    while distance < len(bucket):
+        i = np.arange(len(bucket) - distance)
+        j = i + distance
+        mask = bucket[i] == bucket[j]
+        if not mask.any():
+            break
+        firsts.append(i[mask])
+        seconds.append(j[mask])
+        distance += 1
+
+    if not firsts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(firsts), np.concatenate(seconds)
+
+
+def to_american(prices):
+    """Vectorized OddsArbitrageFinder.decimal_to_american; returns a list of ints"""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        raw = np.where(prices >= 2, (prices - 1) * 100, -100 / (prices - 1))
+    return [-10000 if price <= 1 else round(value) for price, value in zip(prices.tolist(), raw.tolist())]
+
+
+def pair_stats(price1, price2):
+    """
+    Vectorized implied probability and equal-profit stakes for two-way pairs,
+    with the same float operations as calculate_kelly_percentage.
+    Returns a list of (total_prob, stake1, stake2, american1, american2) tuples.
+    """
+    total_prob = 1 / price1 + 1 / price2
+    stake1 = (price2 * 100) / (price1 + price2)
+    stake2 = (price1 * 100) / (price1 + price2)
+    invalid = (stake1 <= 0) | (stake2 <= 0)
+    stake1 = np.where(invalid, 50.0, stake1)
+    stake2 = np.where(invalid, 50.0, stake2)
+    return list(zip(
+        total_prob.tolist(), stake1.tolist(), stake2.tolist(), to_american(price1), to_american(price2)
+    ))
+
+
+def has_many_outcomes(quotes):
+    """True when a line's quotes name more than two outcomes, so no pair of them is a hedge"""
+    teams = set()
+    for quote in quotes:
+        teams.add(quote.team)
+        if len(teams) > 2:
+            return True
+    return False
+
+
+def multiway_stakes(prices):
+    """
+    Sum of implied probabilities and equal-profit stakes (percent of the
+    bankroll) for backing every outcome at the given decimal prices. Stakes
+    are proportional to implied probability, so every leg returns 100 / total.
+    """
+    implied = [1 / price for price in prices]
+    total_prob = sum(implied)
+    return total_prob, [probability * 100 / total_prob for probability in implied]
+
+
+def middle_sweep(low, high, max_gap):
+    """
+    Every (low line, low quote, high line, high quote) whose high line is
+    above the low one by at most max_gap. low and high are (line, quote)
+    lists sorted by line; each low line bisects its window of higher lines,
+    so the cost is one search per line plus the pairs returned.
+    """
+    high_lines = [line for line, _ in high]
+    for line, quote in low:
+        start = bisect_right(high_lines, line)
+        end = bisect_right(high_lines, line + max_gap)
+        for other_line, other in high[start:end]:
+            yield line, quote, other_line, other
+
+
+def middle_numbers(low, high):
+    """Whole numbers strictly between two lines, where both sides of a middle win"""
+    return max(math.ceil(high) - math.floor(low) - 1, 0)
+
+
+ALTERNATE_MARKETS = ['alternate_spreads', 'alternate_totals']
+
+
+class Quote:
+    """
+    One outcome's price at one book. Slots instead of a per-quote dict, and
+    book, team and player names interned so every quote of a slate shares
+    one copy of each string. book is the lowercase title and order the
+    quote's position in its game's traversal; player and prop_type are set
+    for player props only.
+    """
+    __slots__ = ('bookmaker', 'book', 'team', 'price', 'point', 'link', 'order', 'player', 'prop_type')
+
+    def __init__(self, bookmaker, book, team, price, point, link, order, player=None, prop_type=None):
+        self.bookmaker = bookmaker
+        self.book = book
+        self.team = team
+        self.price = price
+        self.point = point
+        self.link = link
+        self.order = order
+        self.player = player
+        self.prop_type = prop_type
+
+    def __repr__(self):
+        return f"Quote({self.bookmaker!r}, {self.team!r}, {self.price!r}, {self.point!r})"
+
+
+class GameQuoteIndex:
+    """
+    Every quote of one game, grouped in a single pass over its bookmakers.
+
+    markets maps a market type to {line: quotes}: the line is the market's
+    own point for featured markets, and the outcome point (absolute for
+    spreads) for alternate lines. props maps (prop market, player) to
+    quotes. Quotes (see Quote) carry the bookmaker's link for props and keep
+    traversal order; views limited to some books order groups by where those
+    books first quote them.
+    """
+    def __init__(self, game, additional_odds=None, player_props=None):
+        self.game = game
+        self.markets = {}
+        self.props = {}
+        self.size = 0
+
+        intern = sys.intern
+        for bookmaker in game['bookmakers'] + list(additional_odds or []):
+            title = intern(bookmaker['title'])
+            book = intern(title.lower())
+            for market in bookmaker['markets']:
+                market_type = market['key']
+                lines = self.markets.setdefault(market_type, {})
+                if market_type in ALTERNATE_MARKETS:
+                    for outcome in market['outcomes']:
+                        point = outcome.get('point')
+                        if point is None:
+                            continue
+                        line = abs(float(point)) if 'spreads' in market_type else point
+                        lines.setdefault(line, []).append(Quote(
+                            title, book, intern(outcome['name']), outcome.get('price', 0), point,
+                            outcome.get('link', ''), self.size
+                        ))
+                        self.size += 1
+                else:
+                    quotes = lines.setdefault(market.get('point', ''), [])
+                    for outcome in market['outcomes']:
+                        quotes.append(Quote(
+                            title, book, intern(outcome['name']), outcome.get('price', 0), outcome.get('point'),
+                            outcome.get('link', ''), self.size
+                        ))
+                        self.size += 1
+
+        for bookmaker in player_props or []:
+            title = intern(bookmaker['title'])
+            book = intern(title.lower())
+            link = bookmaker.get('link', '')
+            for market in bookmaker['markets']:
+                prop_type = intern(market['key'].replace('player_', ''))
+                for outcome in market['outcomes']:
+                    player = intern(outcome.get('description', 'Unknown'))
+                    self.props.setdefault((market['key'], player), []).append(Quote(
+                        title, book, intern(outcome['name']), outcome.get('price', 0), outcome.get('point'),
+                        link, self.size, player, prop_type
+                    ))
+                    self.size += 1
+
+    @staticmethod
+    def select(groups, books):
+        """Groups cut down to quotes from books, ordered by their first remaining quote"""
+        if books is None:
+            return list(groups)
+        selected = []
+        for key, quotes in groups:
+            kept = [quote for quote in quotes if quote.book in books]
+            if kept:
+                selected.append((key, kept))
+        selected.sort(key=lambda item: item[1][0].order)
+        return selected
+
+    def get_quotes(self, market_type, line):
+        return self.markets.get(market_type, {}).get(line, [])
+
+    def get_lines(self, market_type, books=None):
+        """[(line, quotes)] of a market type, from books (lowercase titles) when given"""
+        return self.select(self.markets.get(market_type, {}).items(), books)
+
+    def get_props(self, prop_markets=None, books=None):
+        """[((prop market, player), quotes)] for prop_markets, from books when given"""
+        groups = ((key, quotes) for key, quotes in self.props.items()
+                  if prop_markets is None or key[0] in prop_markets)
+        return self.select(groups, books)
+
+    def subset(self, market_types=(), prop_keys=(), lines=()):
+        """
+        Index over only some market types, (market type, line) pairs and
+        (prop market, player) groups of this one
+        """
+        index = GameQuoteIndex(dict(self.game, bookmakers=[]))
+        index.game = self.game
+        index.markets = {market_type: self.markets[market_type] for market_type in market_types if market_type in self.markets}
+        for market_type, line in lines:
+            if line in self.markets.get(market_type, {}):
+                index.markets.setdefault(market_type, {})[line] = self.markets[market_type][line]
+        index.props = {key: self.props[key] for key in prop_keys if key in self.props}
+        index.size = self.size
+        return index
+
+
+class QuoteTable:
+    """
+    Columnar quote table for a slate: event, market, group (alternate line or
+    player), side, book, line, decimal price and traversal order, plus the
+    GameQuoteIndex quote of every row for building records.
+    """
+    COLUMNS = ['event', 'market', 'group', 'side', 'book', 'line', 'price']
+
+    def __init__(self):
+        self.rows = []
+        self.quotes = []
+        self.codes = {}
+        self.market_keys = []
+
+    def code(self, value):
+        """Intern a string as a small integer"""
+        return self.codes.setdefault(value, len(self.codes))
+
+    def market_code(self, market_key):
+        """Index of a market key in self.market_keys, appending it if new"""
+        if market_key not in self.market_keys:
+            self.market_keys.append(market_key)
+        return self.market_keys.index(market_key)
+
+    def add(self, event, market, group, quote):
+        codes = self.codes
+        point = quote.point
+        # None lines share one sentinel so they still compare equal to each other
+        self.rows.append((
+            event, market, group,
+            codes.setdefault(quote.team, len(codes)), codes.setdefault(quote.bookmaker, len(codes)),
+            np.inf if point is None else point, quote.price
+        ))
+        self.quotes.append(quote)
+
+    def __len__(self):
+        return len(self.quotes)
+
+    def arrays(self):
+        """Return the columns as NumPy arrays"""
+        values = np.array(self.rows, dtype=np.float64).reshape(-1, len(self.COLUMNS))
+        arrays = {name: values[:, i] for i, name in enumerate(self.COLUMNS)}
+        for name in ['event', 'market', 'side', 'book']:
+            arrays[name] = arrays[name].astype(np.int64)
+        arrays['order'] = np.arange(len(self.rows), dtype=np.int64)
+        return arrays
+
+
+class VectorizedDetector:
+    """
+    Arbitrage/low-hold detection over a whole slate at once.
+    Produces the same records, in the same order, as calling
+    OddsArbitrageFinder.find_opportunities game by game. Building the
+    table costs about what the pairing saves, so it measures no faster
+    than the loops (benchmarks/bench_detection.py); scans detect with
+    UnifiedDetector, which also finds +EV bets in the same pass.
+    """
+    def __init__(self, finder):
+        self.finder = finder
+
+    def find_opportunities(self, games, indexes=None):
+        """
+        games: list of (game, additional_odds, player_props) tuples, and
+        optionally their GameQuoteIndexes, built from games when not given.
+        Returns a list of opportunity lists, one per game.
+        """
+        if indexes is None:
+            indexes = [GameQuoteIndex(*game) for game in games]
+        results = [[] for _ in games]
+        for event, record in self.find_market_opportunities(games, indexes):
+            results[event].append(record)
+        for event, record in self.find_prop_opportunities(games, indexes):
+            results[event].append(record)
+        return results
+
+    def build_market_table(self, indexes):
+        """
+        Flatten US-book featured and additional markets of every game. Rows
+        are laid out line by line in first-quote order, which keeps each
+        line's traversal order and the order lines were first quoted.
+        """
+        finder = self.finder
+        us_books = {book.lower() for book in finder.regions['us']}
+        table = QuoteTable()
+        table.market_keys = finder.featured_markets + finder.additional_markets
+
+        for event, index in enumerate(indexes):
+            for market_id, market_type in enumerate(table.market_keys):
+                alternate = market_type in ALTERNATE_MARKETS
+                for line, quotes in index.get_lines(market_type, us_books):
+                    # Three-way and outright lines are left to MultiwayDetector
+                    if has_many_outcomes(quotes):
+                        continue
+                    # Alternate lines are grouped per point, spreads by absolute value
+                    group = float(line) if alternate else 0.0
+                    for quote in quotes:
+                        table.add(event, market_id, group, quote)
+
+        return table
+
+    def build_prop_table(self, games, indexes):
+        """Flatten player prop quotes from US books and Pinnacle of every game"""
+        finder = self.finder
+        valid_books = {book.lower() for book in finder.regions['us'] + ['pinnacle']}
+        table = QuoteTable()
+
+        for event, ((game, _, _), index) in enumerate(zip(games, indexes)):
+            sport = game['sport_key']
+            sport_name = sport.upper().split('_')[1] if '_' in sport else sport.upper()
+            prop_markets = finder.player_props.get(sport_name, [])
+            for (market_key, player), quotes in index.get_props(prop_markets, valid_books):
+                market_id = table.market_code(market_key)
+                player_code = table.code(player)
+                for quote in quotes:
+                    table.add(event, market_id, player_code, quote)
+
+        return table
+
+    def find_market_opportunities(self, games, indexes):
+        """Yield (event index, record) for featured and alternate market opportunities"""
+        finder = self.finder
+        table = self.build_market_table(indexes)
+        if not len(table):
+            return
+
+        market_types = table.market_keys
+        spread_ids = [i for i, market in enumerate(market_types) if 'spreads' in market]
+        total_ids = [i for i, market in enumerate(market_types) if 'totals' in market]
+        a = table.arrays()
+
+        # Best price per (event, market, group, side, line)
+        key = group_codes(a['event'], a['market'], a['group'], a['side'], a['line'])
+        best, rank = best_quotes(key, a['price'], a['order'])
+        group_key = group_codes(a['event'], a['market'], a['group'])
+        group_rank = first_appearance(group_key, a['order'])[group_key[best]]
+
+        event = a['event'][best]
+        market = a['market'][best]
+        line = a['line'][best]
+        is_spread = np.isin(market, spread_ids)
+        is_total = np.isin(market, total_ids)
+
+        # Candidate pairs share event, market and group, plus |line| for spreads or line for totals
+        join_line = np.where(is_spread, np.abs(line), np.where(is_total, line, 0.0))
+        bucket = group_codes(event, market, a['group'][best], join_line)
+        s = np.lexsort((rank, bucket))
+        i, j = bucket_pairs(bucket[s])
+        first, second = s[i], s[j]
+        q1, q2 = best[first], best[second]
+
+        line1, line2 = a['line'][q1], a['line'][q2]
+        valid = a['side'][q1] != a['side'][q2]
+        spread_ok = (
+            np.isfinite(line1) & np.isfinite(line2) & (line1 != 0) & (line2 != 0)
+            & (np.abs(line1 + line2) <= 0.1)
+        )
+        valid &= ~is_spread[first] | spread_ok
+
+        with np.errstate(divide='ignore'):
+            total_prob = 1 / a['price'][q1] + 1 / a['price'][q2]
+        flagged = np.flatnonzero(valid & (total_prob <= finder.low_hold_threshold))
+
+        emit = flagged[np.lexsort((
+            rank[second][flagged], rank[first][flagged], group_rank[first][flagged],
+            market[first][flagged], event[first][flagged]
+        ))]
+
+        stats = pair_stats(a['price'][q1[emit]], a['price'][q2[emit]])
+        for p, values in zip(emit, stats):
+            game = games[event[first[p]]][0]
+            market_type = market_types[market[first[p]]]
+            yield event[first[p]], self.market_record(game, market_type, table.quotes[q1[p]], table.quotes[q2[p]], values)
+
+    def find_prop_opportunities(self, games, indexes):
+        """Yield (event index, record) for player prop opportunities"""
+        finder = self.finder
+        table = self.build_prop_table(games, indexes)
+        if not len(table):
+            return
+
+        a = table.arrays()
+        over_codes = [code for name, code in table.codes.items() if 'OVER' in name.upper()]
+        under_codes = [code for name, code in table.codes.items() if 'UNDER' in name.upper()]
+        is_over = np.isin(a['side'], over_codes)
+        is_under = np.isin(a['side'], under_codes)
+
+        # Best price per (event, market, player, side, book, line)
+        key = group_codes(a['event'], a['market'], a['group'], a['side'], a['book'], a['line'])
+        best, rank = best_quotes(key, a['price'], a['order'])
+        group_key = group_codes(a['event'], a['market'], a['group'])
+        group_rank = first_appearance(group_key, a['order'])[group_key[best]]
+
+        # Candidate pairs share event, market, player and line; try both orientations
+        bucket = group_codes(a['event'][best], a['market'][best], a['group'][best], a['line'][best])
+        s = np.lexsort((rank, bucket))
+        i, j = bucket_pairs(bucket[s])
+        first = np.concatenate([s[i], s[j]])
+        second = np.concatenate([s[j], s[i]])
+        q1, q2 = best[first], best[second]
+
+        valid = (a['book'][q1] != a['book'][q2]) & is_over[q1] & is_under[q2]
+        with np.errstate(divide='ignore'):
+            total_prob = 1 / a['price'][q1] + 1 / a['price'][q2]
+        flagged = np.flatnonzero(valid & (total_prob <= finder.low_hold_threshold))
+
+        event = a['event'][best]
+        emit = flagged[np.lexsort((
+            rank[second][flagged], rank[first][flagged], group_rank[first][flagged], event[first][flagged]
+        ))]
+
+        stats = pair_stats(a['price'][q1[emit]], a['price'][q2[emit]])
+        descriptions = {}
+        for p, values in zip(emit, stats):
+            game = games[event[first[p]]][0]
+            market_key = table.market_keys[a['market'][q1[p]]]
+            if market_key not in descriptions:
+                descriptions[market_key] = finder.get_prop_description(market_key.replace('player_', ''), game['sport_key'])
+            yield event[first[p]], self.prop_record(game, descriptions[market_key], table.quotes[q1[p]], table.quotes[q2[p]], values)
+
+    def market_record(self, game, market_type, odds1, odds2, values):
+        """Build a featured/alternate market opportunity record like find_opportunities"""
+        total_prob, stake1, stake2, american1, american2 = values
+
+        return {
+            'sport': game['sport_title'],
+            'opportunity_type': 'Arbitrage' if total_prob < 1 else 'Low Hold',
+            'market_type': market_type,
+            'market_point': odds1.point,
+            'game': f"{game['home_team']} vs {game['away_team']}",
+            'commence_time': game['commence_time'],
+            'team1_name': odds1.team,
+            'team1_book': odds1.bookmaker,
+            'team1_odds': american1,
+            'team1_point': odds1.point,
+            'team1_stake': round(stake1, 2),
+            'team1_link': odds1.link,
+            'team2_name': odds2.team,
+            'team2_book': odds2.bookmaker,
+            'team2_odds': american2,
+            'team2_point': odds2.point,
+            'team2_stake': round(stake2, 2),
+            'team2_link': odds2.link,
+            'hold_percentage': round((total_prob - 1) * 100, 2),
+            'profit_percentage': round(((1 / total_prob) - 1) * 100, 2) if total_prob < 1 else 0
+        }
+
+    def prop_record(self, game, prop_readable, odds1, odds2, values):
+        """Build a player prop opportunity record like find_opportunities"""
+        total_prob, stake1, stake2, american1, american2 = values
+        point1, point2 = odds1.point, odds2.point
+
+        return {
+            'sport': game['sport_title'],
+            'opportunity_type': 'Arbitrage' if total_prob < 1 else 'Low Hold',
+            'market_type': 'player_prop',
+            'prop_description': f"{odds1.player} - {prop_readable}",
+            'market_point': point1,
+            'game': f"{game['home_team']} vs {game['away_team']}",
+            'commence_time': game['commence_time'],
+            'team1_name': f"{odds1.team} ({point1})",
+            'team1_book': odds1.bookmaker,
+            'team1_odds': american1,
+            'team1_point': point1,
+            'team1_stake': round(stake1, 2),
+            'team1_link': odds1.link,
+            'team2_name': f"{odds2.team} ({point2})",
+            'team2_book': odds2.bookmaker,
+            'team2_odds': american2,
+            'team2_point': point2,
+            'team2_stake': round(stake2, 2),
+            'team2_link': odds2.link,
+            'hold_percentage': round((total_prob - 1) * 100, 2),
+            'profit_percentage': round(((1 / total_prob) - 1) * 100, 2) if total_prob < 1 else 0
+        }
+
+
+def book_sections(quotes):
+    """
+    A group of quotes as ((bookmaker, quote tuples), ...) in traversal order:
+    everything that can change a record built from them, kept per bookmaker
+    """
+    sections = []
+    for quote in quotes:
+        if not sections or sections[-1][0] != quote.bookmaker:
+            sections.append((quote.bookmaker, []))
+        sections[-1][1].append((quote.team, quote.point, quote.price, quote.link))
+    return tuple((bookmaker, tuple(values)) for bookmaker, values in sections)
+
+
+class IncrementalDetector:
+    """
+    Arbitrage and +EV detection that only re-analyzes lines whose quotes moved.
+
+    Each game's GameQuoteIndex is split into detection units: one per line
+    of a featured or additional market, and one per (prop market, player).
+    Pairs never cross lines or players, so units are independent. Every
+    unit keeps its quotes from the last cycle per bookmaker, compared as
+    values rather than hashes; units whose bookmakers all quote the same
+    as last cycle reuse that cycle's records, and only the changed ones
+    are paired and devigged, in one batch. Records are reassembled in the
+    order a full run emits them, so results match a full run.
+    """
+    def __init__(self, finder):
+        self.finder = finder
+        self.results = {}
+        self.settings = None
+        self.stats = {'units': 0, 'changed': 0}
+
+    def split_units(self, game, index):
+        """{unit key: quotes} for a game, in the order a full run emits records"""
+        finder = self.finder
+        us_books = {book.lower() for book in finder.regions['us']}
+        units = {}
+        for market_type in finder.featured_markets + finder.additional_markets:
+            # Lines no US book quotes yield no records; the rest keep their quotes from every book for +EV
+            for line, _ in index.get_lines(market_type, us_books):
+                units[('market', market_type, line)] = index.get_quotes(market_type, line)
+
+        # Props in order of first appearance at the books prop detection reads
+        sport = game['sport_key']
+        sport_name = sport.upper().split('_')[1] if '_' in sport else sport.upper()
+        valid_books = us_books | {'pinnacle'}
+        for (market_key, player), quotes in index.get_props(finder.player_props.get(sport_name, []), valid_books):
+            units[('prop', market_key, player)] = quotes
+        return units
+
+    def detect(self, games, indexes=None):
+        """
+        games: list of (game, additional_odds, player_props) tuples, and
+        optionally their GameQuoteIndexes. Returns (opportunity lists, +EV
+        lists), one list per game.
+        """
+        finder = self.finder
+        settings = (finder.low_hold_threshold, finder.ev_threshold)
+        if settings != self.settings:
+            self.results = {}
+            self.settings = settings
+        if indexes is None:
+            indexes = [GameQuoteIndex(*game) for game in games]
+
+        results = {}
+        changed = []
+        units_by_game = []
+        for (game, _, _), index in zip(games, indexes):
+            units = self.split_units(game, index)
+            header = (game['sport_title'], game['home_team'], game['away_team'], game['commence_time'])
+            for unit_key, quotes in units.items():
+                key = (game['id'], unit_key)
+                snapshot = (header, book_sections(quotes))
+                cached = self.results.get(key)
+                if cached is not None and cached[0] == snapshot:
+                    results[key] = cached
+                elif unit_key[0] == 'market':
+                    changed.append((key, snapshot, game, index.subset(lines=[unit_key[1:]])))
+                else:
+                    changed.append((key, snapshot, game, index.subset(prop_keys=[unit_key[1:]])))
+            units_by_game.append((game['id'], list(units)))
+
+        unit_games = [(game, None, None) for _, _, game, _ in changed]
+        unit_indexes = [index for _, _, _, index in changed]
+        opportunities, plus_ev = finder.unified.detect(unit_games, indexes=unit_indexes)
+        for (key, snapshot, _, _), found, found_plus_ev in zip(changed, opportunities, plus_ev):
+            results[key] = (snapshot, found, found_plus_ev)
+
+        # Only this cycle's units are kept, so finished games fall out
+        self.results = results
+        self.stats = {'units': len(results), 'changed': len(changed)}
+
+        opportunities_by_game = []
+        plus_ev_by_game = []
+        for game_id, unit_keys in units_by_game:
+            opportunities_by_game.append([record for unit_key in unit_keys for record in results[(game_id, unit_key)][1]])
+            plus_ev_by_game.append([record for unit_key in unit_keys for record in results[(game_id, unit_key)][2]])
+        return opportunities_by_game, plus_ev_by_game
+
+
+def ev_percentage(american_odds, fair_odd):
+    """EV of a bet at american_odds against fair_odd, or None when the price is no better than fair"""
+    if not ((american_odds > 0 and fair_odd > 0 and american_odds > fair_odd) or
+            (american_odds < 0 and fair_odd < 0 and american_odds > fair_odd) or
+            (american_odds > 0 and fair_odd < 0)):
+        return None
+    if american_odds > 0:
+        decimal_odds = (american_odds / 100) + 1
+    else:
+        decimal_odds = (100 / abs(american_odds)) + 1
+    if fair_odd > 0:
+        fair_prob = 100 / (fair_odd + 100)
+    else:
+        fair_prob = abs(fair_odd) / (abs(fair_odd) + 100)
+    return (decimal_odds * fair_prob - 1) * 100
+
+
+class UnifiedDetector:
+    """
+    Arbitrage, low-hold and +EV detection in a single pass over a game's quotes.
+
+    detect() reads each game's GameQuoteIndex once: featured and alternate
+    lines from US books for pairing, moneylines from every book so they can
+    be devigged against Pinnacle, and props per market and player from US
+    books and Pinnacle. It emits arbitrage/low-hold and +EV records with the
+    schemas and order of find_opportunities and find_plus_ev_bets, without
+    parsing betslip links the records never use.
+    """
+    def __init__(self, finder):
+        self.finder = finder
+        self.logger = logging.getLogger('plus_ev_finder')
+
+    def detect(self, games, arbitrage=True, plus_ev=True, all_books=False, indexes=None):
+        """
+        games: list of (game, additional_odds, player_props) tuples, and
+        optionally their GameQuoteIndexes. Markets are paired across US
+        books only unless all_books is set.
+        Returns (opportunity lists, +EV lists), one list per game.
+        """
+        finder = self.finder
+        us_books = {book.lower() for book in finder.regions['us']}
+        valid_books = us_books | {'pinnacle'}
+        pair_books = None if all_books else us_books
+        opportunities_by_game = []
+        plus_ev_by_game = []
+        prop_lines = []
+        if plus_ev:
+            logging.basicConfig(level=logging.INFO)
+        if indexes is None:
+            indexes = [GameQuoteIndex(*game) for game in games]
+
+        for position, ((game, _, _), index) in enumerate(zip(games, indexes)):
+            opportunities = []
+            plus_ev_bets = []
+
+            if arbitrage:
+                for market_type in finder.featured_markets + finder.additional_markets:
+                    for _, market_odds in index.get_lines(market_type, pair_books):
+                        # Three-way and outright lines are left to MultiwayDetector
+                        if not has_many_outcomes(market_odds):
+                            opportunities.extend(self.market_opportunities(game, market_type, market_odds))
+
+            if plus_ev:
+                for _, market_odds in index.get_lines('h2h'):
+                    plus_ev_bets.extend(self.moneyline_plus_ev(game, market_odds, us_books))
+
+            sport = game['sport_key']
+            sport_name = sport.upper().split('_')[1] if '_' in sport else sport.upper()
+            for _, market_odds in index.get_props(finder.player_props.get(sport_name, []), valid_books):
+                prop_readable = finder.get_prop_description(market_odds[0].prop_type, game['sport_key'])
+                if arbitrage:
+                    opportunities.extend(self.prop_opportunities(game, prop_readable, market_odds))
+                if plus_ev:
+                    pinnacle_odds, common_points = self.pinnacle_prop_lines(market_odds)
+                    if common_points:
+                        prop_lines.append((position, prop_readable, market_odds, pinnacle_odds, common_points))
+
+            opportunities_by_game.append(opportunities)
+            plus_ev_by_game.append(plus_ev_bets)
+
+        if prop_lines:
+            # Devig every Pinnacle prop line of every game in one batch
+            with finder.metrics.span('power_devig'):
+                fair_odds = power_devig_batch([
+                    [finder.decimal_to_american(pinnacle_odds['over'][point].price),
+                     finder.decimal_to_american(pinnacle_odds['under'][point].price)]
+                    for _, _, _, pinnacle_odds, common_points in prop_lines
+                    for point in common_points
+                ]).tolist()
+            start = 0
+            failed = set()
+            for position, prop_readable, market_odds, _, common_points in prop_lines:
+                fair_odds_by_point = fair_odds[start:start + len(common_points)]
+                start += len(common_points)
+                if position in failed:
+                    continue
+                # A failure stops the +EV prop search for the rest of the game, as it always has
+                try:
+                    self.prop_plus_ev(games[position][0], prop_readable, market_odds, common_points,
+                                      fair_odds_by_point, us_books, plus_ev_by_game[position])
+                except Exception as e:
+                    self.logger.error(f"Error processing player props: {str(e)}", exc_info=True)
+                    failed.add(position)
+
+        return opportunities_by_game, plus_ev_by_game
+
+    def detect_game(self, game, additional_odds=None, player_props=None, arbitrage=True, plus_ev=True, all_books=False):
+        """Return (arbitrage/low-hold records, +EV records) for one game"""
+        opportunities, plus_ev_bets = self.detect([(game, additional_odds, player_props)], arbitrage, plus_ev, all_books)
+        return opportunities[0], plus_ev_bets[0]
+
+    def market_opportunities(self, game, market_type, market_odds):
+        """Arbitrage/low-hold records for one featured market or alternate line"""
+        finder = self.finder
+        odds_by_team = {}
+        for odds in market_odds:
+            key = f"{odds.team}_{odds.point}"
+            if key not in odds_by_team or odds.price > odds_by_team[key].price:
+                odds_by_team[key] = odds
+        best = list(odds_by_team.values())
+
+        spreads = 'spreads' in market_type
+        totals = 'totals' in market_type
+        records = []
+        for i, odds1 in enumerate(best):
+            for odds2 in best[i + 1:]:
+                if odds1.team == odds2.team:
+                    continue
+                if spreads:
+                    point1 = float(odds1.point or 0)
+                    point2 = float(odds2.point or 0)
+                    if point1 == 0 or point2 == 0 or abs(point1 + point2) > 0.1:
+                        continue
+                if totals and odds1.point != odds2.point:
+                    continue
+                if odds1.price <= 0 or odds2.price <= 0:
+                    continue
+
+                total_prob = 1 / odds1.price + 1 / odds2.price
+                if total_prob > finder.low_hold_threshold:
+                    continue
+                stake1, stake2 = finder.calculate_kelly_percentage(
+                    1 / odds1.price, 1 / odds2.price, odds1.price, odds2.price
+                )
+                records.append({
+                    'sport': game['sport_title'],
+                    'opportunity_type': 'Arbitrage' if total_prob < 1 else 'Low Hold',
+                    'market_type': market_type,
+                    'market_point': odds1.point,
+                    'game': f"{game['home_team']} vs {game['away_team']}",
+                    'commence_time': game['commence_time'],
+                    'team1_name': odds1.team,
+                    'team1_book': odds1.bookmaker,
+                    'team1_odds': finder.decimal_to_american(odds1.price),
+                    'team1_point': odds1.point,
+                    'team1_stake': round(stake1, 2),
+                    'team1_link': odds1.link,
+                    'team2_name': odds2.team,
+                    'team2_book': odds2.bookmaker,
+                    'team2_odds': finder.decimal_to_american(odds2.price),
+                    'team2_point': odds2.point,
+                    'team2_stake': round(stake2, 2),
+                    'team2_link': odds2.link,
+                    'hold_percentage': round((total_prob - 1) * 100, 2),
+                    'profit_percentage': round(((1 / total_prob) - 1) * 100, 2) if total_prob < 1 else 0
+                })
+        return records
+
+    def prop_opportunities(self, game, prop_readable, market_odds):
+        """Over/under arbitrage/low-hold records across books for one player prop"""
+        finder = self.finder
+        odds_by_outcome = {}
+        for odds in market_odds:
+            key = f"{odds.team}_{odds.bookmaker}_{odds.point}"
+            if key not in odds_by_outcome or odds.price > odds_by_outcome[key].price:
+                odds_by_outcome[key] = odds
+        best = list(odds_by_outcome.values())
+        by_point = {}
+        for position, odds in enumerate(best):
+            by_point.setdefault(odds.point, []).append(position)
+
+        records = []
+        processed_pairs = set()
+        for i, odds1 in enumerate(best):
+            if 'OVER' not in odds1.team.upper():
+                continue
+            for j in by_point[odds1.point]:
+                odds2 = best[j]
+                if j == i or odds1.bookmaker == odds2.bookmaker or 'UNDER' not in odds2.team.upper():
+                    continue
+                pair_key = (min(i, j), max(i, j))
+                if pair_key in processed_pairs:
+                    continue
+                processed_pairs.add(pair_key)
+                if odds1.price <= 0 or odds2.price <= 0:
+                    continue
+
+                total_prob = 1 / odds1.price + 1 / odds2.price
+                if total_prob > finder.low_hold_threshold:
+                    continue
+                stake1, stake2 = finder.calculate_kelly_percentage(
+                    1 / odds1.price, 1 / odds2.price, odds1.price, odds2.price
+                )
+                records.append({
+                    'sport': game['sport_title'],
+                    'opportunity_type': 'Arbitrage' if total_prob < 1 else 'Low Hold',
+                    'market_type': 'player_prop',
+                    'prop_description': f"{odds1.player} - {prop_readable}",
+                    'market_point': odds1.point,
+                    'game': f"{game['home_team']} vs {game['away_team']}",
+                    'commence_time': game['commence_time'],
+                    'team1_name': f"{odds1.team} ({odds1.point})",
+                    'team1_book': odds1.bookmaker,
+                    'team1_odds': finder.decimal_to_american(odds1.price),
+                    'team1_point': odds1.point,
+                    'team1_stake': round(stake1, 2),
+                    'team1_link': odds1.link,
+                    'team2_name': f"{odds2.team} ({odds2.point})",
+                    'team2_book': odds2.bookmaker,
+                    'team2_odds': finder.decimal_to_american(odds2.price),
+                    'team2_point': odds2.point,
+                    'team2_stake': round(stake2, 2),
+                    'team2_link': odds2.link,
+                    'hold_percentage': round((total_prob - 1) * 100, 2),
+                    'profit_percentage': round(((1 / total_prob) - 1) * 100, 2) if total_prob < 1 else 0
+                })
+        return records
+
+    def moneyline_plus_ev(self, game, market_odds, us_books):
+        """+EV records for US book moneylines against Pinnacle's devigged line"""
+        finder = self.finder
+        pinnacle_odds = [odds for odds in market_odds if odds.book == 'pinnacle']
+        if len(pinnacle_odds) != 2:
+            return []
+
+        pinnacle_odds.sort(key=lambda x: x.team)
+        with finder.metrics.span('power_devig', sport=game['sport_key']):
+            fair_odds = power_devig([finder.decimal_to_american(odds.price) for odds in pinnacle_odds])
+
+        records = []
+        for odds in market_odds:
+            if odds.book not in us_books:
+                continue
+            american_odds = finder.decimal_to_american(odds.price)
+            fair_odd = fair_odds[0 if odds.team == pinnacle_odds[0].team else 1]
+            ev = ev_percentage(american_odds, fair_odd)
+            if ev is not None and ev >= finder.ev_threshold:
+                self.logger.info(f"Found +EV opportunity!")
+                records.append({
+                    'sport': game['sport_title'],
+                    'market_type': 'Moneyline',
+                    'market_point': None,
+                    'game': f"{game['home_team']} vs {game['away_team']}",
+                    'commence_time': game['commence_time'],
+                    'team': odds.team,
+                    'bookmaker': odds.bookmaker,
+                    'odds': american_odds,
+                    'fair_odds': fair_odd,
+                    'ev_percentage': round(ev, 2),
+                    'link': odds.link
+                })
+        return records
+
+    def pinnacle_prop_lines(self, market_odds):
+        """Pinnacle's over and under quotes per line of a player prop, and the lines quoted both ways"""
+        pinnacle_odds = {'over': {}, 'under': {}}
+        for odds in market_odds:
+            if odds.book == 'pinnacle':
+                if 'OVER' in odds.team.upper():
+                    pinnacle_odds['over'][str(odds.point)] = odds
+                elif 'UNDER' in odds.team.upper():
+                    pinnacle_odds['under'][str(odds.point)] = odds
+        return pinnacle_odds, list(set(pinnacle_odds['over'].keys()) & set(pinnacle_odds['under'].keys()))
+
+    def prop_plus_ev(self, game, prop_readable, market_odds, common_points, fair_odds_by_point, us_books, records):
+        """Append +EV records for US book prop prices against the devigged Pinnacle line at each point"""
+        finder = self.finder
+        player_name = market_odds[0].player
+        for point, fair_odds in zip(common_points, fair_odds_by_point):
+            for odds in market_odds:
+                if odds.point != float(point) or odds.book == 'pinnacle':
+                    continue
+                if odds.book not in us_books:
+                    continue
+                american_odds = finder.decimal_to_american(odds.price)
+                fair_odd = fair_odds[0] if 'OVER' in odds.team.upper() else fair_odds[1]
+                ev = ev_percentage(american_odds, fair_odd)
+                if ev is not None and ev >= finder.ev_threshold:
+                    self.logger.info(f"Found +EV prop: {odds.bookmaker} {odds.team} @ {american_odds}")
+                    records.append({
+                        'sport': game['sport_title'],
+                        'market_type': f"Player Prop - {prop_readable}",
+                        'market_point': point,
+                        'game': f"{game['home_team']} vs {game['away_team']}",
+                        'commence_time': game['commence_time'],
+                        'team': f"{player_name} {odds.team}",
+                        'bookmaker': odds.bookmaker,
+                        'odds': american_odds,
+                        'fair_odds': fair_odd,
+                        'ev_percentage': round(ev, 2),
+                        'link': odds.link
+                    })
+
+
+class MultiwayDetector:
+    """
+    Arbitrage and low-hold detection for lines with three or more outcomes:
+    three-way moneylines (regulation-time soccer and hockey) and outrights.
+    The finder only fetches h2h_3_way, for the sports listed in its
+    multiway_event_markets; outrights are scanned if something supplies them.
+
+    One pass over a line's US book quotes keeps the best price per outcome;
+    the line is an arbitrage when the implied probabilities of those prices
+    sum to under 1, and low hold under low_hold_threshold, so the cost is
+    linear in the quotes rather than in pairs or combinations of outcomes.
+    A line is only scanned when one book quotes every outcome seen on it,
+    so an outcome no book listed cannot hide the overround.
+    """
+    def __init__(self, finder):
+        self.finder = finder
+
+    def find_opportunities(self, games, indexes=None):
+        """
+        games: list of (game, additional_odds, player_props) tuples, and
+        optionally their GameQuoteIndexes. Returns one record list per game.
+        """
+        finder = self.finder
+        us_books = {book.lower() for book in finder.regions['us']}
+        if indexes is None:
+            indexes = [GameQuoteIndex(*game) for game in games]
+
+        results = []
+        for (game, _, _), index in zip(games, indexes):
+            records = []
+            for market_type in finder.multiway_markets:
+                for line, quotes in index.get_lines(market_type, us_books):
+                    record = self.line_opportunity(game, market_type, line, quotes)
+                    if record is not None:
+                        records.append(record)
+            results.append(records)
+        return results
+
+    def line_opportunity(self, game, market_type, line, quotes):
+        """Arbitrage/low-hold record for one line with equal-profit stakes on every leg, or None"""
+        finder = self.finder
+        best = {}
+        outcomes_by_book = {}
+        for quote in quotes:
+            outcomes_by_book.setdefault(quote.book, set()).add(quote.team)
+            if quote.price > 0 and (quote.team not in best or quote.price > best[quote.team].price):
+                best[quote.team] = quote
+
+        outcomes = set().union(*outcomes_by_book.values())
+        if len(outcomes) < 3 or len(best) < len(outcomes):
+            return None
+        if max(len(names) for names in outcomes_by_book.values()) < len(outcomes):
+            return None
+
+        legs = list(best.values())
+        total_prob, stakes = multiway_stakes([leg.price for leg in legs])
+        if total_prob > finder.low_hold_threshold:
+            return None
+        return {
+            'sport': game['sport_title'],
+            'opportunity_type': 'Arbitrage' if total_prob < 1 else 'Low Hold',
+            'market_type': market_type,
+            'market_point': None if line == '' else line,
+            # Outright events have no teams
+            'game': f"{game['home_team']} vs {game['away_team']}" if game.get('home_team') else game['sport_title'],
+            'commence_time': game['commence_time'],
+            'outcomes': len(legs),
+            'legs': [
+                {
+                    'name': leg.team,
+                    'book': leg.bookmaker,
+                    'odds': finder.decimal_to_american(leg.price),
+                    'point': leg.point,
+                    'stake': round(stake, 2),
+                    'link': leg.link
+                }
+                for leg, stake in zip(legs, stakes)
+            ],
+            'hold_percentage': round((total_prob - 1) * 100, 2),
+            'profit_percentage': round(((1 / total_prob) - 1) * 100, 2) if total_prob < 1 else 0
+        }
+
+
+class MiddleDetector:
+    """
+    Middles: an over (or the away spread) at one line against an under (or
+    the home spread) at a higher line, so a final total or margin landing
+    between the two lines wins both bets.
+
+    Featured and alternate lines are pooled per game and side at US books,
+    keeping the best price per line, and each side is sorted by line.
+    Spreads are read from the home team's side, so away -3.5 sits at home
+    +3.5. middle_sweep then bisects each low line's window of higher lines
+    up to middle_max_gap instead of pairing every alternate line.
+
+    Stakes equalize the return, so missing the middle costs the hold and
+    hitting it wins both legs. The chance of hitting is market-implied: the
+    devigged chance the low side wins at its line, less the same chance at
+    the high line, from books quoting both sides of each. Pushes on whole
+    number lines are ignored.
+    """
+    def __init__(self, finder):
+        self.finder = finder
+
+    def find_middles(self, games, indexes=None):
+        """
+        games: list of (game, additional_odds, player_props) tuples, and
+        optionally their GameQuoteIndexes. Returns one record list per game.
+        """
+        finder = self.finder
+        us_books = {book.lower() for book in finder.regions['us']}
+        if indexes is None:
+            indexes = [GameQuoteIndex(*game) for game in games]
+
+        results = []
+        for (game, _, _), index in zip(games, indexes):
+            sport = game['sport_key']
+            sport_name = sport.upper().split('_')[1] if '_' in sport else sport.upper()
+            records = []
+
+            # Outright events have no teams
+            if game.get('home_team'):
+                spreads = [quote for market_type in ('spreads', 'alternate_spreads')
+                           for _, quotes in index.get_lines(market_type, us_books) for quote in quotes]
+                away = self.side_lines([quote for quote in spreads if quote.team == game['away_team']], -1)
+                home = self.side_lines([quote for quote in spreads if quote.team == game['home_team']])
+                records.extend(self.middle_records(game, 'spreads', away, home))
+
+            totals = [quote for market_type in ('totals', 'alternate_totals')
+                      for _, quotes in index.get_lines(market_type, us_books) for quote in quotes]
+            overs = self.side_lines([quote for quote in totals if 'OVER' in quote.team.upper()])
+            unders = self.side_lines([quote for quote in totals if 'UNDER' in quote.team.upper()])
+            records.extend(self.middle_records(game, 'totals', overs, unders))
+
+            for (_, player), quotes in index.get_props(finder.player_props.get(sport_name, []), us_books):
+                prop_readable = finder.get_prop_description(quotes[0].prop_type, sport)
+                overs = self.side_lines([quote for quote in quotes if 'OVER' in quote.team.upper()])
+                unders = self.side_lines([quote for quote in quotes if 'UNDER' in quote.team.upper()])
+                records.extend(self.middle_records(game, 'player_prop', overs, unders, f"{player} - {prop_readable}"))
+            results.append(records)
+        return results
+
+    @staticmethod
+    def side_lines(quotes, sign=1):
+        """
+        (line, best quote) sorted by line, and {line: {book: price}}, for one
+        side. sign=-1 reads a spread from the other team's side.
+        """
+        best = {}
+        prices = {}
+        for quote in quotes:
+            if quote.point is None or quote.price <= 0:
+                continue
+            line = sign * float(quote.point)
+            prices.setdefault(line, {})[quote.book] = quote.price
+            if line not in best or quote.price > best[line].price:
+                best[line] = quote
+        return sorted(best.items(), key=lambda item: item[0]), prices
+
+    @staticmethod
+    def low_side_chances(low_prices, high_prices):
+        """{line: devigged chance the low side wins there}, averaged over books quoting both sides"""
+        chances = {}
+        for line, prices in low_prices.items():
+            opposite = high_prices.get(line)
+            if not opposite:
+                continue
+            book_chances = [
+                (1 / price) / (1 / price + 1 / opposite[book])
+                for book, price in prices.items() if book in opposite
+            ]
+            if book_chances:
+                chances[line] = sum(book_chances) / len(book_chances)
+        return chances
+
+    def middle_records(self, game, market_type, low, high, prop_description=None):
+        """Middle records between a low and a high side whose estimated EV reaches middle_min_ev"""
+        finder = self.finder
+        (low_lines, low_prices), (high_lines, high_prices) = low, high
+        chances = None
+        records = []
+        for low_line, odds1, high_line, odds2 in middle_sweep(low_lines, high_lines, finder.middle_max_gap):
+            numbers = middle_numbers(low_line, high_line)
+            if not numbers:
+                continue
+            if chances is None:
+                chances = self.low_side_chances(low_prices, high_prices)
+            if low_line not in chances or high_line not in chances:
+                continue
+            middle_probability = max(chances[low_line] - chances[high_line], 0.0)
+            total_prob = 1 / odds1.price + 1 / odds2.price
+            # Missing returns 1 / total_prob of the stake, hitting twice that
+            ev = (1 / total_prob - 1) + middle_probability / total_prob
+            if ev * 100 < finder.middle_min_ev:
+                continue
+            stake1, stake2 = finder.calculate_kelly_percentage(
+                1 / odds1.price, 1 / odds2.price, odds1.price, odds2.price
+            )
+            record = {
+                'sport': game['sport_title'],
+                'opportunity_type': 'Middle',
+                'market_type': market_type,
+                'game': f"{game['home_team']} vs {game['away_team']}",
+                'commence_time': game['commence_time'],
+                'team1_name': odds1.team,
+                'team1_book': odds1.bookmaker,
+                'team1_odds': finder.decimal_to_american(odds1.price),
+                'team1_point': odds1.point,
+                'team1_stake': round(stake1, 2),
+                'team1_link': odds1.link,
+                'team2_name': odds2.team,
+                'team2_book': odds2.bookmaker,
+                'team2_odds': finder.decimal_to_american(odds2.price),
+                'team2_point': odds2.point,
+                'team2_stake': round(stake2, 2),
+                'team2_link': odds2.link,
+                'gap': round(high_line - low_line, 2),
+                'middle_numbers': numbers,
+                'middle_probability': round(middle_probability * 100, 2),
+                'hold_percentage': round((total_prob - 1) * 100, 2),
+                'miss_percentage': round((1 / total_prob - 1) * 100, 2),
+                'hit_percentage': round((2 / total_prob - 1) * 100, 2),
+                'ev_percentage': round(ev * 100, 2)
+            }
+            if prop_description:
+                record['prop_description'] = prop_description
+            records.append(record)
+        return records
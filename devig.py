@@ -0,0 +1,116 @@
+import math
+import numpy as np
+
+
+def american_to_prob(odds):
+    """Convert American odds to implied probability"""
+    if odds > 0:
+        return 100 / (odds + 100)
+    else:
+        return abs(odds) / (abs(odds) + 100)
+
+
+def prob_to_american(prob):
+    """Convert a probability to American odds"""
+    if prob >= 0.5:
+        return -100 * prob / (1 - prob)
+    else:
+        return 100 * (1 - prob) / prob
+
+
+def solve_power(probs, tolerance=1e-12, max_iterations=100):
+    """
+    Find the exponent k with sum(p ** k) == 1.
+    The sum is decreasing in k, so Newton steps are kept inside a bracket
+    and fall back to bisection whenever they would leave it.
+    """
+    logs = [math.log(prob) for prob in probs]
+    
+    def excess(power):
+        return sum(prob ** power for prob in probs) - 1
+    
+    # excess(0) = len(probs) - 1 >= 0; widen the upper end until the sum drops below 1
+    low, high = 0.0, 1.0
+    while excess(high) > 0 and high < 1e6:
+        low, high = high, high * 2
+    
+    power = 1.0
+    for _ in range(max_iterations):
+        value = excess(power)
+        if abs(value) <= tolerance:
+            break
+        if value > 0:
+            low = power
+        else:
+            high = power
+        
+        slope = sum(prob ** power * log for prob, log in zip(probs, logs))
+        step = power - value / slope if slope else None
+        power = step if step is not None and low < step < high else (low + high) / 2
+    
+    return power
+
+
+def power_devig(odds_list):
+    """
+    Devig odds using the power method to find fair probabilities
+    """
+    probs = [american_to_prob(odds) for odds in odds_list]
+    
+    # Calculate the vig-free exponent
+    power = solve_power(probs)
+    total = sum(prob ** power for prob in probs)
+    
+    # Calculate fair probabilities
+    fair_probs = [(prob ** power) / total for prob in probs]
+    
+    # Convert back to American odds
+    return [round(prob_to_american(p)) for p in fair_probs]
+
+
+def power_devig_batch(odds_matrix, tolerance=1e-12, max_iterations=100):
+    """
+    Devig many markets at once with the power method.
+    odds_matrix is a 2D array-like of American odds, one market per row;
+    pad rows with fewer outcomes with NaN. Returns an integer array of fair
+    American odds with the same shape (padding entries are 0).
+    """
+    odds = np.atleast_2d(np.asarray(odds_matrix, dtype=float))
+    valid = ~np.isnan(odds)
+    safe_odds = np.where(valid, odds, -100.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        probs = np.where(safe_odds > 0, 100 / (safe_odds + 100), np.abs(safe_odds) / (np.abs(safe_odds) + 100))
+    logs = np.log(probs)
+    
+    def excess(power):
+        return np.where(valid, probs ** power[:, None], 0).sum(axis=1) - 1
+    
+    rows = odds.shape[0]
+    low = np.zeros(rows)
+    high = np.ones(rows)
+    widen = excess(high) > 0
+    while widen.any() and high.max() < 1e6:
+        low = np.where(widen, high, low)
+        high = np.where(widen, high * 2, high)
+        widen = excess(high) > 0
+    
+    power = np.ones(rows)
+    for _ in range(max_iterations):
+        value = excess(power)
+        if np.all(np.abs(value) <= tolerance):
+            break
+        low = np.where(value > 0, power, low)
+        high = np.where(value > 0, high, power)
+        
+        slope = np.where(valid, probs ** power[:, None] * logs, 0).sum(axis=1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            step = power - value / slope
+        in_bracket = (step > low) & (step < high)
+        done = np.abs(value) <= tolerance
+        power = np.where(done, power, np.where(in_bracket, step, (low + high) / 2))
+    
+    scaled = np.where(valid, probs ** power[:, None], 0)
+    fair_probs = scaled / scaled.sum(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        fair_odds = np.where(fair_probs >= 0.5, -100 * fair_probs / (1 - fair_probs), 100 * (1 - fair_probs) / fair_probs)
+    return np.where(valid, np.rint(fair_odds), 0).astype(int)
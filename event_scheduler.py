@@ -0,0 +1,121 @@
+import time
+import heapq
+import threading
+from datetime import datetime
+
+
+# (seconds until commence_time, poll interval) checked in order; later games poll every FAR_INTERVAL
+POLL_TIERS = [
+    (3600, 60),
+    (3 * 3600, 180),
+    (12 * 3600, 600),
+    (48 * 3600, 1800)
+]
+FAR_INTERVAL = 3600
+
+
+def parse_time(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+def latest_update(bookmakers):
+    """Most recent bookmaker or market last_update across a list of bookmakers"""
+    updates = [bookmaker.get('last_update') or '' for bookmaker in bookmakers]
+    updates += [market.get('last_update') or '' for bookmaker in bookmakers for market in bookmaker.get('markets', [])]
+    return max(updates, default='')
+
+
+class EventScheduler:
+    """
+    Decides which fetches are due each scan cycle.
+
+    Every key (an event's per-event markets, or a sport's featured odds)
+    gets a poll interval from its time to commence_time (POLL_TIERS),
+    scaled by how often its quotes changed lately: a key whose latest
+    last_update moved on every recent poll polls up to twice as often, one
+    that never moves up to half as often. Due keys sit in a priority queue
+    by due time, so the most overdue work is dispatched first; the last
+    fetched data is kept to serve keys that are not yet due.
+    """
+    def __init__(self, tiers=POLL_TIERS, far_interval=FAR_INTERVAL, min_interval=60, smoothing=0.5):
+        self.tiers = tiers
+        self.far_interval = far_interval
+        self.min_interval = min_interval
+        self.smoothing = smoothing
+        self.lock = threading.Lock()
+        self.queue = []
+        self.entries = {}
+
+    def get_base_interval(self, commence_time, now):
+        until_start = parse_time(commence_time) - now
+        for threshold, interval in self.tiers:
+            if until_start < threshold:
+                return interval
+        return self.far_interval
+
+    def pop_due(self, keys, now=None):
+        """
+        Keys among keys that are due (or never fetched), most overdue first.
+        Due keys leave the queue until record() reschedules them.
+        """
+        now = now or time.time()
+        keys = list(keys)
+        with self.lock:
+            due = []
+            while self.queue and self.queue[0][0] <= now:
+                due_at, key = heapq.heappop(self.queue)
+                entry = self.entries.get(key)
+                # Skip queue items superseded by a later record()
+                if entry is not None and entry['due'] == due_at:
+                    entry['due'] = None
+                    due.append(key)
+            wanted = set(keys)
+            due = [key for key in due if key in wanted]
+            # Never fetched, or popped earlier but not fetched since
+            seen = set(due)
+            for key in keys:
+                entry = self.entries.get(key)
+                if (entry is None or entry['due'] is None) and key not in seen:
+                    due.append(key)
+                    seen.add(key)
+        return due
+
+    def record(self, key, commence_time, data, last_update='', now=None):
+        """Store freshly fetched data for a key and schedule its next poll"""
+        now = now or time.time()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                change_rate = 0.5
+            else:
+                changed = 1.0 if last_update != entry['last_update'] else 0.0
+                change_rate = self.smoothing * changed + (1 - self.smoothing) * entry['change_rate']
+
+            base = self.get_base_interval(commence_time, now)
+            interval = max(self.min_interval, base * (1.5 - change_rate))
+            due = now + interval
+            self.entries[key] = {
+                'data': data, 'last_update': last_update, 'change_rate': change_rate,
+                'interval': interval, 'due': due, 'fetched_at': now
+            }
+            heapq.heappush(self.queue, (due, key))
+
+    def get_data(self, key, default=None):
+        with self.lock:
+            entry = self.entries.get(key)
+            return entry['data'] if entry is not None else default
+
+    def retain(self, keys):
+        """Forget keys that are no longer scheduled (finished or removed events)"""
+        keys = set(keys)
+        with self.lock:
+            for key in [key for key in self.entries if key not in keys]:
+                del self.entries[key]
+            self.queue = [item for item in self.queue if item[1] in keys]
+            heapq.heapify(self.queue)
+
+    def get_next_due(self):
+        """Seconds until the next key comes due, or None when nothing is scheduled"""
+        with self.lock:
+            pending = [entry['due'] for entry in self.entries.values() if entry['due'] is not None]
+        return max(min(pending) - time.time(), 0) if pending else None
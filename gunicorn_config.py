@@ -4,3 +4,7 @@ workers = 1
 threads = 1
 timeout = 300
 
+def post_worker_init(worker):
+    # Start background scans as soon as the worker is up instead of on the first request
+    from app import refresher
+    refresher.start()
@@ -0,0 +1,177 @@
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+
+
+class NullSpan:
+    """Shared no-op context manager returned by span() while instrumentation is disabled"""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+NULL_SPAN = NullSpan()
+
+
+def escape_label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def format_labels(labels):
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{key}="{escape_label(value)}"' for key, value in labels) + '}'
+
+
+class Instrumentation:
+    """
+    Lightweight timing spans, counters and gauges for the scan pipeline.
+
+    span(stage, sport=..., event=...) times a block. Every span feeds a
+    cumulative histogram per (stage, sport), and spans recorded between
+    start_cycle() and end_cycle() also make up the last cycle's breakdown by
+    stage/sport and by event. render_prometheus() exposes everything in the
+    Prometheus text format. When disabled, span() returns a shared no-op.
+    """
+    def __init__(self, enabled=True, buckets=DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.lock = threading.Lock()
+        self.histograms = {}
+        self.counters = {}
+        self.gauges = {}
+        self.help = {}
+        self.cycle = None
+        self.cycle_started = None
+        self.last_cycle = None
+
+    def span(self, stage, sport=None, event=None):
+        """Context manager timing one stage, tagged by sport and event"""
+        if not self.enabled:
+            return NULL_SPAN
+        return self.timed(stage, sport, event)
+
+    @contextmanager
+    def timed(self, stage, sport, event):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - start, sport, event)
+
+    def observe(self, stage, seconds, sport=None, event=None):
+        """Record a duration for a stage"""
+        if not self.enabled:
+            return
+        key = (stage, sport or '')
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram['buckets'][i] += 1
+            histogram['sum'] += seconds
+            histogram['count'] += 1
+
+            if self.cycle is not None:
+                stages = self.cycle['stages']
+                total, count = stages.get(key, (0.0, 0))
+                stages[key] = (total + seconds, count + 1)
+                if event is not None:
+                    event_key = (stage, sport or '', event)
+                    self.cycle['events'][event_key] = self.cycle['events'].get(event_key, 0.0) + seconds
+
+    def increment(self, name, amount=1, help_text=None, **labels):
+        """Add to a counter"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+            if help_text:
+                self.help[name] = help_text
+
+    def set_gauge(self, name, value, help_text=None, **labels):
+        """Set a gauge to a value"""
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.gauges[key] = value
+            if help_text:
+                self.help[name] = help_text
+
+    def start_cycle(self):
+        """Begin collecting a per-cycle breakdown"""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.cycle = {'stages': {}, 'events': {}}
+            self.cycle_started = time.time()
+
+    def end_cycle(self):
+        """Publish the current cycle's breakdown as the last cycle"""
+        if not self.enabled or self.cycle is None:
+            return
+        with self.lock:
+            self.cycle['duration'] = time.time() - self.cycle_started
+            self.cycle['finished_at'] = time.time()
+            self.last_cycle = self.cycle
+            self.cycle = None
+
+    def render_prometheus(self):
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self.lock:
+            if self.histograms:
+                lines.append('# HELP odds_stage_seconds Time spent in each pipeline stage')
+                lines.append('# TYPE odds_stage_seconds histogram')
+                for (stage, sport), histogram in sorted(self.histograms.items()):
+                    labels = [('stage', stage), ('sport', sport)]
+                    for bound, count in zip(self.buckets, histogram['buckets']):
+                        lines.append(f"odds_stage_seconds_bucket{format_labels(labels + [('le', bound)])} {count}")
+                    lines.append(f"odds_stage_seconds_bucket{format_labels(labels + [('le', '+Inf')])} {histogram['count']}")
+                    lines.append(f"odds_stage_seconds_sum{format_labels(labels)} {histogram['sum']:.6f}")
+                    lines.append(f"odds_stage_seconds_count{format_labels(labels)} {histogram['count']}")
+
+            if self.last_cycle is not None:
+                lines.append('# HELP odds_last_cycle_seconds Wall time of the last completed scan cycle')
+                lines.append('# TYPE odds_last_cycle_seconds gauge')
+                lines.append(f"odds_last_cycle_seconds {self.last_cycle['duration']:.6f}")
+                lines.append('# HELP odds_last_cycle_timestamp_seconds Unix time the last scan cycle finished')
+                lines.append('# TYPE odds_last_cycle_timestamp_seconds gauge')
+                lines.append(f"odds_last_cycle_timestamp_seconds {self.last_cycle['finished_at']:.3f}")
+
+                lines.append('# HELP odds_last_cycle_stage_seconds Time per stage and sport in the last scan cycle')
+                lines.append('# TYPE odds_last_cycle_stage_seconds gauge')
+                for (stage, sport), (total, count) in sorted(self.last_cycle['stages'].items()):
+                    lines.append(f"odds_last_cycle_stage_seconds{format_labels([('stage', stage), ('sport', sport)])} {total:.6f}")
+
+                lines.append('# HELP odds_last_cycle_event_seconds Time per stage and event in the last scan cycle')
+                lines.append('# TYPE odds_last_cycle_event_seconds gauge')
+                for (stage, sport, event), total in sorted(self.last_cycle['events'].items()):
+                    labels = [('stage', stage), ('sport', sport), ('event', event)]
+                    lines.append(f"odds_last_cycle_event_seconds{format_labels(labels)} {total:.6f}")
+
+            for kind, values in [('counter', self.counters), ('gauge', self.gauges)]:
+                seen = set()
+                for (name, labels), value in sorted(values.items(), key=lambda item: (item[0][0], item[0][1])):
+                    if name not in seen:
+                        seen.add(name)
+                        if name in self.help:
+                            lines.append(f"# HELP {name} {self.help[name]}")
+                        lines.append(f"# TYPE {name} {kind}")
+                    lines.append(f"{name}{format_labels(labels)} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+
+# Process-wide instance; set METRICS_ENABLED=0 to turn spans into no-ops
+metrics = Instrumentation(enabled=os.getenv('METRICS_ENABLED', '1') != '0')
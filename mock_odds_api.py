@@ -0,0 +1,205 @@
+import json
+import time
+import random
+import argparse
+import threading
+from flask import Flask, jsonify, request
+from werkzeug.serving import make_server
+from synthetic_odds import SyntheticOddsGenerator, SLATES
+from response_archive import ResponseReplayer, request_key, request_cost
+
+
+class MockOddsAPI:
+    """
+    Local stand-in for the Odds API endpoints OddsArbitrageFinder uses.
+
+    Serves payloads from recorded responses ({request_key: payload}) when
+    given, falling back to a SyntheticOddsGenerator. latency/jitter delay
+    every response, error_rate answers a fraction of requests with a 500,
+    rate_limit (requests per second, with burst) answers the excess with 429
+    and Retry-After, and quota tracks x-requests-* headers like the real API.
+    """
+    def __init__(self, generator=None, recorded=None, latency=0.0, jitter=0.0, error_rate=0.0,
+                 rate_limit=None, burst=None, quota=None, seed=None):
+        self.generator = generator or SyntheticOddsGenerator()
+        self.recorded = recorded or {}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.burst = burst or (rate_limit or 1)
+        self.quota = quota
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.tokens = self.burst
+        self.last_refill = time.monotonic()
+        self.used = 0
+        self.stats = {'requests': 0, 'ok': 0, 'errors': 0, 'throttled': 0, 'not_found': 0, 'out_of_quota': 0}
+
+        for sport in self.generator.events_per_sport:
+            self.generator.events(sport)
+
+        self.app = Flask('mock_odds_api')
+        self.app.add_url_rule('/v4/sports', 'sports', self.sports)
+        self.app.add_url_rule('/v4/sports/', 'sports_slash', self.sports)
+        self.app.add_url_rule('/v4/sports/<sport>/events', 'events', self.events)
+        self.app.add_url_rule('/v4/sports/<sport>/odds', 'odds', self.odds)
+        self.app.add_url_rule('/v4/sports/<sport>/events/<event_id>/odds', 'event_odds', self.event_odds)
+        self.app.add_url_rule('/mock/stats', 'mock_stats', self.get_stats)
+
+    @classmethod
+    def from_archive(cls, path, **kwargs):
+        """
+        Build a server replaying recorded responses, either a response archive
+        written with ODDS_API_RECORD (.jsonl.gz, latest response per request)
+        or a JSON file of {request_key: payload}
+        """
+        if path.endswith('.gz'):
+            return cls(recorded=ResponseReplayer(path).latest_payloads(), **kwargs)
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(recorded=json.load(f), **kwargs)
+
+    def count(self, outcome):
+        with self.lock:
+            self.stats[outcome] += 1
+
+    def take_token(self):
+        """Token bucket; returns seconds until the next token, or 0 if this request may proceed"""
+        if not self.rate_limit:
+            return 0
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate_limit)
+            self.last_refill = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate_limit
+
+    def respond(self, path, build_payload):
+        """Apply latency, throttling, errors and quota around a payload builder"""
+        self.count('requests')
+        params = request.args.to_dict()
+
+        delay = self.latency + (self.random.uniform(0, self.jitter) if self.jitter else 0)
+        if delay:
+            time.sleep(delay)
+
+        wait = self.take_token()
+        if wait:
+            self.count('throttled')
+            response = jsonify({'message': 'Too many requests', 'error_code': 'EXCEEDED_FREQ_LIMIT'})
+            response.status_code = 429
+            response.headers['Retry-After'] = f"{wait:.2f}"
+            return response
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.count('errors')
+            response = jsonify({'message': 'Internal server error'})
+            response.status_code = 500
+            return response
+
+        cost = request_cost(path, params)
+        with self.lock:
+            if self.quota is not None and self.used + cost > self.quota:
+                out_of_quota = True
+            else:
+                out_of_quota = False
+                self.used += cost
+            used = self.used
+
+        if out_of_quota:
+            self.count('out_of_quota')
+            response = jsonify({'message': 'Usage quota has been reached', 'error_code': 'OUT_OF_USAGE_CREDITS'})
+            response.status_code = 401
+        else:
+            key = request_key(path, params)
+            payload = self.recorded[key] if key in self.recorded else build_payload(params)
+            if payload is None:
+                self.count('not_found')
+                response = jsonify({'message': 'Event not found', 'error_code': 'EVENT_NOT_FOUND'})
+                response.status_code = 404
+            else:
+                self.count('ok')
+                response = jsonify(payload)
+                if payload == []:
+                    # Like the real API, requests that return no events cost nothing
+                    with self.lock:
+                        self.used -= cost
+                        used = self.used
+                    cost = 0
+
+        response.headers['x-requests-used'] = str(used)
+        response.headers['x-requests-last'] = str(0 if out_of_quota else cost)
+        if self.quota is not None:
+            response.headers['x-requests-remaining'] = str(max(self.quota - used, 0))
+        return response
+
+    def sports(self):
+        return self.respond('/sports', lambda params: self.generator.sports())
+
+    def events(self, sport):
+        return self.respond(f"/{sport}/events", lambda params: self.generator.events(sport))
+
+    def odds(self, sport):
+        return self.respond(f"/{sport}/odds", lambda params: self.generator.odds(
+            sport, params.get('regions', 'us'), params.get('markets', 'h2h')))
+
+    def event_odds(self, sport, event_id):
+        return self.respond(f"/{sport}/events/{event_id}/odds", lambda params: self.generator.event_odds(
+            sport, event_id, params.get('regions', 'us'), params.get('markets', 'h2h')))
+
+    def get_stats(self):
+        with self.lock:
+            return jsonify(dict(self.stats, used=self.used))
+
+
+class MockOddsServer:
+    """Runs a MockOddsAPI on a background thread; base_url plugs into OddsArbitrageFinder"""
+    def __init__(self, api=None, host='127.0.0.1', port=0):
+        self.api = api or MockOddsAPI()
+        self.server = make_server(host, port, self.api.app, threaded=True)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.server.host}:{self.server.port}/v4/sports"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.server.serve_forever, name='mock-odds-api', daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Local stand-in for the Odds API')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=5001)
+    parser.add_argument('--slate', default='weeknight', choices=list(SLATES))
+    parser.add_argument('--archive', help='recorded responses to replay (.jsonl.gz archive or JSON)')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='extra random latency, up to this many seconds')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with a 500')
+    parser.add_argument('--rate-limit', type=float, help='requests per second before answering 429')
+    parser.add_argument('--burst', type=int, help='requests allowed at once before throttling')
+    parser.add_argument('--quota', type=int, help='request credits before answering 401')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    options = dict(
+        generator=SyntheticOddsGenerator(SLATES[args.slate], seed=args.seed),
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+        rate_limit=args.rate_limit, burst=args.burst, quota=args.quota, seed=args.seed
+    )
+    api = MockOddsAPI.from_archive(args.archive, **options) if args.archive else MockOddsAPI(**options)
+    print(f"Mock Odds API on http://{args.host}:{args.port}/v4/sports "
+          f"(set ODDS_API_BASE_URL to point the finder at it)")
+    api.app.run(host=args.host, port=args.port, threaded=True)
+
+
+if __name__ == "__main__":
+    main()
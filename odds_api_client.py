@@ -0,0 +1,180 @@
+import random
+import time
+import sqlite3
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from response_archive import ResponseRecorder, ResponseReplayer
+from response_cache import ResponseCache
+
+
+class OddsAPIClient:
+    """
+    Shared keep-alive HTTP session for Odds API calls.
+    Every request gets connect/read timeouts and is retried with jittered
+    exponential backoff on connection errors, timeouts, 429 and 5xx responses.
+    Successful responses are memoized for the current cycle, so the same
+    endpoint/params/event is only fetched once between start_cycle() calls.
+
+    record_to appends every raw response to a compressed archive;
+    replay_from serves responses from such an archive instead of the
+    network, one recorded cycle per start_cycle(). cache_path keeps a
+    persistent ResponseCache so fresh responses survive restarts.
+    """
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    def __init__(self, pool_size=10, connect_timeout=3.05, read_timeout=20,
+                 max_retries=3, backoff_factor=0.5, max_backoff=10, record_to=None, replay_from=None,
+                 cache_path=None, cache_max_bytes=256 * 2 ** 20):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.logger = logging.getLogger('odds_api_client')
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        self.memo = {}
+        self.memo_hits = 0
+        self.memo_misses = 0
+        self.memo_lock = threading.Lock()
+
+        self.recorder = ResponseRecorder(record_to) if record_to else None
+        self.replayer = ResponseReplayer(replay_from) if replay_from else None
+        self.cache = ResponseCache(cache_path, max_bytes=cache_max_bytes) if cache_path else None
+        self.response_hooks = []  # Called with every response received from the network
+
+    def start_cycle(self):
+        """Clear the request memo and its counters at the start of a scan cycle"""
+        with self.memo_lock:
+            self.memo = {}
+            self.memo_hits = 0
+            self.memo_misses = 0
+        if self.recorder:
+            self.recorder.start_cycle()
+        if self.replayer:
+            self.replayer.start_cycle()
+        if self.cache:
+            self.cache.start_cycle()
+
+    def get_memo_key(self, url, params=None):
+        """Memo key from the endpoint URL (which carries the event id) and request params"""
+        params = params or {}
+        return (url, tuple(sorted((k, str(v)) for k, v in params.items() if k != 'apiKey')))
+
+    def get_memo_stats(self):
+        """Return request memo hit/miss counts for the current cycle"""
+        with self.memo_lock:
+            total = self.memo_hits + self.memo_misses
+            return {
+                'hits': self.memo_hits,
+                'misses': self.memo_misses,
+                'hit_rate': round(self.memo_hits / total, 4) if total else 0.0
+            }
+
+    def get_backoff(self, attempt, response=None):
+        """Seconds to wait before the next attempt, honoring Retry-After on throttled responses"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after:
+                try:
+                    return min(float(retry_after), self.max_backoff)
+                except ValueError:
+                    pass
+
+        # Full jitter: a random wait between 0 and the exponential cap
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, delay)
+
+    def get(self, url, params=None):
+        """
+        GET a URL through the shared session, consulting the cycle memo first.
+        Returns the final response (which may still be an error status once
+        retries are exhausted) or raises requests.exceptions.RequestException.
+        """
+        key = self.get_memo_key(url, params)
+        with self.memo_lock:
+            if key in self.memo:
+                self.memo_hits += 1
+                return self.memo[key]
+            self.memo_misses += 1
+
+        if self.replayer:
+            response = self.replayer.get(url, params)
+        elif self.cache:
+            response = self.fetch_cached(url, params)
+        else:
+            response = self.fetch(url, params)
+        if self.recorder:
+            self.recorder.write(url, params, response)
+        if response.status_code == 200:
+            with self.memo_lock:
+                self.memo[key] = response
+        return response
+
+    def fetch_cached(self, url, params=None):
+        """
+        Serve from the persistent cache, revalidating or refetching stale
+        entries. A cache failure (e.g. another process holding the database
+        lock) falls back to the network rather than failing the scan.
+        """
+        try:
+            response, conditional_headers = self.cache.lookup(url, params)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Response cache lookup for {url} failed ({e}), fetching instead")
+            return self.fetch(url, params)
+        if response is not None:
+            return response
+
+        response = self.fetch(url, params, headers=conditional_headers)
+        if response.status_code == 304:
+            try:
+                cached = self.cache.revalidated(url, params)
+            except sqlite3.Error as e:
+                self.logger.warning(f"Response cache revalidation for {url} failed ({e}), fetching instead")
+                cached = None
+            return cached or self.fetch(url, params)
+        try:
+            self.cache.store(url, params, response)
+        except sqlite3.Error as e:
+            self.logger.warning(f"Response cache store for {url} failed ({e})")
+        return response
+
+    def get_cache_stats(self):
+        """Persistent cache counters for the current cycle, or None without a cache"""
+        return self.cache.get_stats() if self.cache else None
+
+    def fetch(self, url, params=None, headers=None):
+        """GET a URL with timeouts and retries, bypassing the memo"""
+        for attempt in range(self.max_retries + 1):
+            try:
+                response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+                if attempt >= self.max_retries:
+                    raise
+                delay = self.get_backoff(attempt)
+                self.logger.warning(f"Request to {url} failed ({e}), retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+
+            if response.status_code in self.RETRY_STATUSES and attempt < self.max_retries:
+                delay = self.get_backoff(attempt, response)
+                self.logger.warning(f"Request to {url} returned {response.status_code}, retrying in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+
+            for hook in self.response_hooks:
+                hook(response)
+            return response
+
+    def close(self):
+        """Close pooled connections and any recording archive"""
+        self.session.close()
+        if self.recorder:
+            self.recorder.close()
+        if self.cache:
+            self.cache.close()
@@ -5,49 +5,27 @@ import time
 import json
 import logging
 import os
+from concurrent.futures import ThreadPoolExecutor
 from betslip import BetslipURLGenerator
+from odds_api_client import OddsAPIClient
+from detection_engine import GameQuoteIndex, IncrementalDetector, UnifiedDetector, MultiwayDetector, MiddleDetector
+from instrumentation import metrics
+from quota_planner import QuotaPlanner
+from event_scheduler import EventScheduler, latest_update
+from devig import power_devig
 
-def power_devig(odds_list):
-    """
-    Devig odds using the power method to find fair probabilities
-    """
-    # Convert American odds to probabilities
-    def american_to_prob(odds):
-        if odds > 0:
-            return 100 / (odds + 100)
-        else:
-            return abs(odds) / (abs(odds) + 100)
-            
-    probs = [american_to_prob(odds) for odds in odds_list]
-    
-    # Calculate the vig-free scalar
-    power = 1  # Start with power of 1
-    total = sum(prob ** power for prob in probs)
-    while abs(total - 1) > 0.0001:  # Adjust power until probabilities sum to 1
-        if total > 1:
-            power += 0.0001
-        else:
-            power -= 0.0001
-        total = sum(prob ** power for prob in probs)
-    
-    # Calculate fair probabilities
-    fair_probs = [(prob ** power) / total for prob in probs]
-    
-    # Convert back to American odds
-    def prob_to_american(prob):
-        if prob >= 0.5:
-            return -100 * prob / (1 - prob)
-        else:
-            return 100 * (1 - prob) / prob
-            
-    return [round(prob_to_american(p)) for p in fair_probs]
+
+# In-season sport keys from /sports, shared across the finders one process can build
+# (app.py, scheduled_odds_tracker.py and quota_planner.main each make their own)
+active_sports_cache = {'sports': None, 'fetched_at': 0.0}
 
 
 class OddsArbitrageFinder:  
-    def __init__(self, api_key, state='md'):
+    def __init__(self, api_key, state='md', max_workers=8, base_url=None):
         self.api_key = api_key
         self.state = state.lower()
-        self.base_url = "https://api.the-odds-api.com/v4/sports"
+        # ODDS_API_BASE_URL points scans at a stand-in such as mock_odds_api.py
+        self.base_url = base_url or os.getenv('ODDS_API_BASE_URL', "https://api.the-odds-api.com/v4/sports")
         self.sports = [
             'americanfootball_ncaaf',
             'basketball_ncaab',
@@ -58,6 +36,14 @@ class OddsArbitrageFinder:
         
         self.featured_markets = ['h2h', 'spreads', 'totals']
         self.additional_markets = ['alternate_spreads', 'alternate_totals']
+        # Markets whose lines can have three or more outcomes (draws, futures), scanned by MultiwayDetector
+        self.multiway_markets = ['h2h', 'h2h_3_way', 'outrights']
+        # Three-way markets requested per event for the sports that offer them. Outrights
+        # are never fetched: they live under their own sport keys (e.g.
+        # icehockey_nhl_championship_winner), none of which are in self.sports
+        self.multiway_event_markets = {
+            'NHL': ['h2h_3_way']
+        }
         
         # Add player prop markets by sport
         self.player_props = {
@@ -83,12 +69,44 @@ class OddsArbitrageFinder:
         
         self.low_hold_threshold = 1.05
         self.ev_threshold = 2.0  # Minimum +EV percentage to include
+        self.middle_max_gap = 10  # Widest gap in points between a middle's two lines
+        self.middle_min_ev = 0.0  # Minimum estimated EV percentage to include a middle
         self.all_odds_data = []
         self.all_opportunities = []
         self.all_plus_ev = []
+        self.all_multiway = []
+        self.all_middles = []
         self.all_player_props = {}  # Add this to store player props
         self.url_generator = BetslipURLGenerator()
         self.state = state.lower()
+        self.max_workers = max_workers  # Concurrent per-event requests; 1 fetches sequentially
+        # ODDS_API_RECORD archives every raw response; ODDS_API_REPLAY scans from such an archive.
+        # ODDS_API_CACHE names a persistent response cache file (e.g. odds_response_cache.sqlite3);
+        # unset, responses are not cached across requests
+        replay_from = os.getenv('ODDS_API_REPLAY')
+        self.client = OddsAPIClient(
+            pool_size=max(max_workers, len(self.regions)),
+            record_to=os.getenv('ODDS_API_RECORD'),
+            replay_from=replay_from,
+            cache_path=None if replay_from else os.getenv('ODDS_API_CACHE')
+        )
+        # ODDS_API_HOURLY_BUDGET caps the quota spent per hour; cycles are trimmed to fit
+        hourly_budget = os.getenv('ODDS_API_HOURLY_BUDGET')
+        self.planner = QuotaPlanner(
+            hourly_budget=float(hourly_budget) if hourly_budget else None,
+            cycle_interval=int(os.getenv('REFRESH_INTERVAL', 60))
+        )
+        self.client.response_hooks.append(self.planner.observe)
+        # Featured odds and per-event markets are refetched on their own cadence, not every cycle.
+        # Replayed cycles fetch everything so they reproduce what was recorded
+        self.scheduler = None if replay_from else EventScheduler()
+        self.unified = UnifiedDetector(self)  # One pass per game for arbitrage, low-hold and +EV
+        self.incremental_detection = True  # Re-analyze only markets whose quotes changed since the last cycle
+        self.incremental = IncrementalDetector(self)
+        self.multiway = MultiwayDetector(self)
+        self.middle_finder = MiddleDetector(self)
+        self.metrics = metrics
+        self.active_sports_ttl = int(os.getenv('ACTIVE_SPORTS_TTL', 6 * 3600))  # Seconds between /sports checks
         
         
     
@@ -117,7 +135,7 @@ class OddsArbitrageFinder:
             }
             
             # logger.info(f"Fetching US props for {sport} event {event_id}")
-            response = requests.get(url, params=us_params)
+            response = self.client.get(url, params=us_params)
             if response.status_code == 200:
                 data = response.json()
                 us_bookmakers = data.get('bookmakers', [])
@@ -138,7 +156,7 @@ class OddsArbitrageFinder:
             }
             
             # logger.info(f"Fetching Pinnacle props for {sport} event {event_id}")
-            response = requests.get(url, params=eu_params)
+            response = self.client.get(url, params=eu_params)
             if response.status_code == 200:
                 data = response.json()
                 eu_bookmakers = data.get('bookmakers', [])
@@ -155,38 +173,14 @@ class OddsArbitrageFinder:
         return all_bookmakers
 
     def process_player_props(self, bookmakers, sport):
-        markets = {}
-        
-        # Include both US and Pinnacle
-        valid_books = [book.lower() for book in self.regions['us'] + ['pinnacle']]
-        bookmakers = [bm for bm in bookmakers if bm['title'].lower() in valid_books]
-        
+        """Prop quotes from US books and Pinnacle, grouped as {market_player: [Quote]}"""
+        valid_books = {book.lower() for book in self.regions['us'] + ['pinnacle']}
         sport_name = sport.upper().split('_')[1] if '_' in sport else sport.upper()
-        prop_markets = self.player_props.get(sport_name, [])
-        
-        
-        for bookmaker in bookmakers:
-            for market in bookmaker['markets']:
-                if market['key'] in prop_markets:
-                    for outcome in market['outcomes']:
-                        player_name = outcome.get('description', 'Unknown')
-                        prop_type = market['key'].replace('player_', '')
-                        market_key = f"{market['key']}_{player_name}"
-                        
-                        if market_key not in markets:
-                            markets[market_key] = []
-                        
-                        markets[market_key].append({
-                            'bookmaker': bookmaker['title'],
-                            'player': player_name,
-                            'prop_type': prop_type,
-                            'team': outcome['name'],
-                            'price': outcome.get('price', 0),
-                            'point': outcome.get('point'),
-                            'link': bookmaker.get('link', '')
-                        })
-        
-        return markets
+        index = GameQuoteIndex({'bookmakers': []}, player_props=bookmakers)
+        return {
+            f"{market_key}_{player}": quotes
+            for (market_key, player), quotes in index.get_props(self.player_props.get(sport_name, []), valid_books)
+        }
 
     def get_prop_description(self, prop_type, sport_name):
         """Convert prop type to readable format"""
@@ -237,6 +231,31 @@ class OddsArbitrageFinder:
             return -10000 
 
 
+    def get_active_sports(self):
+        """
+        The subset of self.sports that is in season, from the /sports endpoint
+        (which costs no quota). The list is cached for active_sports_ttl
+        seconds across instances; if it can't be fetched, every sport is scanned.
+        """
+        now = time.time()
+        if active_sports_cache['sports'] is None or now - active_sports_cache['fetched_at'] > self.active_sports_ttl:
+            try:
+                response = self.client.get(self.base_url, params={'apiKey': self.api_key})
+                response.raise_for_status()
+                active_sports_cache['sports'] = {sport['key'] for sport in response.json() if sport.get('active')}
+                active_sports_cache['fetched_at'] = now
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"Error fetching active sports: {e}")
+                if active_sports_cache['sports'] is None:
+                    return list(self.sports)
+        
+        return [sport for sport in self.sports if sport in active_sports_cache['sports']]
+
+    def has_us_coverage(self, game):
+        """Whether any US book quotes the game's featured markets; if none do, props and alternates won't be posted either"""
+        us_books = {book.lower() for book in self.regions['us']}
+        return any(bookmaker['title'].lower() in us_books for bookmaker in game['bookmakers'])
+
     def get_events(self, sport):
         """Fetch upcoming events for a sport"""
         url = f"{self.base_url}/{sport}/events"
@@ -246,7 +265,7 @@ class OddsArbitrageFinder:
         }
         
         try:
-            response = requests.get(url, params=params)
+            response = self.client.get(url, params=params)
             response.raise_for_status()
             data = response.json()
             current_time = datetime.now(timezone.utc)
@@ -263,14 +282,9 @@ class OddsArbitrageFinder:
     def get_featured_odds(self, sport):
         """Fetch odds for featured markets with multiple regions"""
         current_time = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
-        all_odds = []
-        
-        # Track seen events to avoid duplicates
-        seen_events = set()
+        url = f"{self.base_url}/{sport}/odds"
         
-        # Fetch odds for each region
-        for region, bookmakers in self.regions.items():
-            url = f"{self.base_url}/{sport}/odds"
+        def fetch_region(region):
             params = {
                 'apiKey': self.api_key,
                 'regions': region,
@@ -281,38 +295,50 @@ class OddsArbitrageFinder:
             }
             
             try:
-                response = requests.get(url, params=params)
+                response = self.client.get(url, params=params)
                 response.raise_for_status()
-                odds_data = response.json()
-                
-                for event in odds_data:
-                    event_id = event['id']
-                    
-                    if event_id not in seen_events:
-                        # For first occurrence of event, add all matching bookmakers
-                        if bookmakers:
-                            # Filter specific bookmakers if specified
-                            event['bookmakers'] = [
-                                b for b in event['bookmakers'] 
-                                if b['title'].lower() in [bm.lower() for bm in bookmakers]
-                            ]
-                        all_odds.append(event)
-                        seen_events.add(event_id)
-                    else:
-                        # For duplicate events, only add new bookmakers
-                        existing_event = next(e for e in all_odds if e['id'] == event_id)
-                        existing_books = {b['title'] for b in existing_event['bookmakers']}
-                        
-                        for bookmaker in event['bookmakers']:
-                            if bookmakers and bookmaker['title'].lower() not in [bm.lower() for bm in bookmakers]:
-                                continue
-                            if bookmaker['title'] not in existing_books:
-                                existing_event['bookmakers'].append(bookmaker)
-                    
+                return response.json()
             except requests.exceptions.RequestException as e:
                 print(f"Error fetching odds for {sport} in region {region}: {e}")
+                return []
         
-        return all_odds
+        # Fetch all regions concurrently, then merge in region order
+        regions = list(self.regions.items())
+        with ThreadPoolExecutor(max_workers=len(regions)) as executor:
+            region_odds = list(executor.map(fetch_region, [region for region, _ in regions]))
+        
+        # Events keyed by id (insertion order kept) with the set of book titles already merged
+        events_by_id = {}
+        books_by_id = {}
+        
+        for (region, bookmakers), odds_data in zip(regions, region_odds):
+            allowed_books = {bm.lower() for bm in bookmakers}
+            
+            for event in odds_data:
+                event_id = event['id']
+                
+                if event_id not in events_by_id:
+                    # For first occurrence of event, add all matching bookmakers
+                    if allowed_books:
+                        event['bookmakers'] = [
+                            b for b in event['bookmakers']
+                            if b['title'].lower() in allowed_books
+                        ]
+                    events_by_id[event_id] = event
+                    books_by_id[event_id] = {b['title'] for b in event['bookmakers']}
+                else:
+                    # For duplicate events, only add new bookmakers
+                    existing_event = events_by_id[event_id]
+                    existing_books = books_by_id[event_id]
+                    
+                    for bookmaker in event['bookmakers']:
+                        if allowed_books and bookmaker['title'].lower() not in allowed_books:
+                            continue
+                        if bookmaker['title'] not in existing_books:
+                            existing_event['bookmakers'].append(bookmaker)
+                            existing_books.add(bookmaker['title'])
+        
+        return list(events_by_id.values())
 
     def get_event_odds(self, sport, event_id):
         """Fetch odds for additional markets for a specific event"""
@@ -328,18 +354,77 @@ class OddsArbitrageFinder:
                 'includeLinks': 'true'
             }
             
-            response = requests.get(url, params=params)
+            response = self.client.get(url, params=params)
             if response.status_code == 200:
                 data = response.json()
                 bookmakers = data.get('bookmakers', [])
                 all_odds.extend(bookmakers)
             
         except requests.exceptions.RequestException as e:
-            if response.status_code != 404:
-                print(f"Error fetching additional odds for event {event_id}: {e}")
+            print(f"Error fetching additional odds for event {event_id}: {e}")
         
         return all_odds
 
+    def get_additional_markets(self, sport):
+        """Non-prop markets requested per event: the alternates plus the sport's three-way markets"""
+        sport_name = sport.upper().split('_')[1] if '_' in sport else sport.upper()
+        return self.additional_markets + self.multiway_event_markets.get(sport_name, [])
+
+    def get_event_markets(self, sport, event_id, additional_markets=None, prop_markets=None):
+        """
+        Fetch additional markets and player props for an event: one us request
+        for the additional markets and one us,eu request for the props, since
+        the API bills every market in a request once per region.
+        Returns (additional_odds, player_props) bookmaker lists shaped like the
+        results of get_event_odds and get_player_props. Markets default to
+        get_additional_markets(sport) and the sport's player props.
+        """
+        url = f"{self.base_url}/{sport}/events/{event_id}/odds"
+        sport_name = sport.upper().split('_')[1] if '_' in sport else sport.upper()
+        if additional_markets is None:
+            additional_markets = self.get_additional_markets(sport)
+        if prop_markets is None:
+            prop_markets = self.player_props.get(sport_name, [])
+        if not additional_markets and not prop_markets:
+            return [], []
+        
+        def fetch(markets, regions):
+            if not markets:
+                return []
+            params = {
+                'apiKey': self.api_key,
+                'regions': regions,
+                'markets': ','.join(markets),
+                'oddsFormat': 'decimal',
+                'includeLinks': 'true'
+            }
+            
+            try:
+                with self.metrics.span('fetch_event_markets', sport=sport, event=event_id):
+                    response = self.client.get(url, params=params)
+                if response.status_code != 200:
+                    return []
+                return response.json().get('bookmakers', [])
+            except requests.exceptions.RequestException as e:
+                print(f"Error fetching event markets for event {event_id}: {e}")
+                return []
+        
+        # Keep only the requested markets: additional markets from US books (as
+        # get_event_odds requested) and player props from US books and Pinnacle
+        us_books = {book.lower() for book in self.regions['us']}
+        additional_odds = []
+        player_props = []
+        for bookmaker in fetch(additional_markets, 'us'):
+            additional = [m for m in bookmaker['markets'] if m['key'] in additional_markets]
+            if additional and bookmaker['title'].lower() in us_books:
+                additional_odds.append({**bookmaker, 'markets': additional})
+        for bookmaker in fetch(prop_markets, 'us,eu'):
+            props = [m for m in bookmaker['markets'] if m['key'] in prop_markets]
+            if props:
+                player_props.append({**bookmaker, 'markets': props})
+        
+        return additional_odds, player_props
+
     def calculate_implied_probability(self, decimal_odds):
         """Convert decimal odds to implied probability"""
         return 1 / decimal_odds
@@ -393,521 +478,38 @@ class OddsArbitrageFinder:
         return html
 
     def process_markets(self, bookmakers, market_type):
-        """Process markets from bookmakers data with proper handling of alternate lines"""
-        markets = {}
-        
-        for bookmaker in bookmakers:
-            for market in bookmaker['markets']:
-                if market['key'] == market_type:
-                    # For alternate markets, create unique keys including the point value
-                    if market_type in ['alternate_spreads', 'alternate_totals']:
-                        for outcome in market['outcomes']:
-                            point = outcome.get('point')
-                            if point is not None:
-                                # For spreads, use the absolute value as key to group matching spreads
-                                key_point = abs(float(point)) if 'spreads' in market_type else point
-                                market_key = f"{market['key']}_{key_point}"
-                                
-                                if market_key not in markets:
-                                    markets[market_key] = []
-                                
-                                # Extract IDs from existing link if available
-                                book_name, params = self.url_generator.parse_existing_url(outcome.get('link', ''))
-                                
-                                markets[market_key].append({
-                                    'bookmaker': bookmaker['title'],
-                                    'team': outcome['name'],
-                                    'price': outcome.get('price', 0),
-                                    'point': point,
-                                    'link': outcome.get('link', ''),
-                                    'market_id': params.get('market_id'),
-                                    'selection_id': params.get('selection_id'),
-                                    'event_id': params.get('event_id'),
-                                    'outcome_id': params.get('outcome_id')
-                                })
-                    else:
-                        # Handle standard markets as before
-                        market_key = f"{market['key']}_{market.get('point', '')}"
-                        
-                        if market_key not in markets:
-                            markets[market_key] = []
-                        
-                        for outcome in market['outcomes']:
-                            book_name, params = self.url_generator.parse_existing_url(outcome.get('link', ''))
-                            
-                            markets[market_key].append({
-                                'bookmaker': bookmaker['title'],
-                                'team': outcome['name'],
-                                'price': outcome.get('price', 0),
-                                'point': outcome.get('point', None),
-                                'link': outcome.get('link', ''),
-                                'market_id': params.get('market_id'),
-                                'selection_id': params.get('selection_id'),
-                                'event_id': params.get('event_id'),
-                                'outcome_id': params.get('outcome_id')
-                            })
-        
-        return markets
+        """
+        Quotes of one market type grouped as {market_line: [Quote]}; alternate
+        markets get a group per line (spreads by absolute point).
+        """
+        index = GameQuoteIndex({'bookmakers': bookmakers})
+        return {f"{market_type}_{line}": quotes for line, quotes in index.get_lines(market_type)}
     
-    def find_opportunities(self, game, additional_odds=None):
-        opportunities = []
-        # logging.basicConfig(level=logging.DEBUG)
-        # logger = logging.getLogger('arbitrage_finder')
-        
-        us_books = self.regions['us']
-        all_bookmakers = game['bookmakers']
-        if additional_odds:
-            all_bookmakers.extend(additional_odds)
-        
-        all_bookmakers = [bm for bm in all_bookmakers if bm['title'].lower() in [b.lower() for b in us_books]]
-
-        for market_type in self.featured_markets + self.additional_markets:
-            markets = self.process_markets(all_bookmakers, market_type)
-            
-            for market_key, market_odds in markets.items():
-                odds_by_team = {}
-                for odds in market_odds:
-                    key = f"{odds['team']}_{odds.get('point', '')}"
-                    if key not in odds_by_team or odds['price'] > odds_by_team[key]['price']:
-                        odds_by_team[key] = odds
-                
-                processed_pairs = set()
-                for key1, odds1 in odds_by_team.items():
-                    for key2, odds2 in odds_by_team.items():
-                        if key1 != key2:
-                            if odds1['team'] == odds2['team']:
-                                continue
-                                
-                            if (odds1['bookmaker'].lower() not in [b.lower() for b in us_books] or 
-                                odds2['bookmaker'].lower() not in [b.lower() for b in us_books]):
-                                continue
-                                
-                            if ('spreads' in market_type or 'alternate_spreads' in market_type):
-                                point1 = float(odds1.get('point', 0) or 0)
-                                point2 = float(odds2.get('point', 0) or 0)
-                                
-                                if point1 == 0 or point2 == 0:
-                                    continue
-                                    
-                                if abs(point1 + point2) > 0.1:
-                                    continue
-                            
-                            if ('totals' in market_type or 'alternate_totals' in market_type):
-                                if odds1.get('point') != odds2.get('point'):
-                                    continue
-                            
-                            pair_key = tuple(sorted([key1, key2]))
-                            if pair_key not in processed_pairs:
-                                processed_pairs.add(pair_key)
-                                
-                                prob1 = self.calculate_implied_probability(odds1['price'])
-                                prob2 = self.calculate_implied_probability(odds2['price'])
-                                total_prob = prob1 + prob2
-                                
-                                if total_prob <= self.low_hold_threshold:
-                                    stake1, stake2 = self.calculate_kelly_percentage(
-                                        prob1, prob2, odds1['price'], odds2['price']
-                                    )
-                                    
-                                    hold_percentage = (total_prob - 1) * 100
-                                    opportunity_type = 'Arbitrage' if total_prob < 1 else 'Low Hold'
-                                    profit_percentage = round(((1 / total_prob) - 1) * 100, 2) if total_prob < 1 else 0
-                                    
-                                    opportunities.append({
-                                        'sport': game['sport_title'],
-                                        'opportunity_type': opportunity_type,
-                                        'market_type': market_type,
-                                        'market_point': odds1.get('point'),
-                                        'game': f"{game['home_team']} vs {game['away_team']}",
-                                        'commence_time': game['commence_time'],
-                                        'team1_name': odds1['team'],
-                                        'team1_book': odds1['bookmaker'],
-                                        'team1_odds': self.decimal_to_american(odds1['price']),
-                                        'team1_point': odds1.get('point'),
-                                        'team1_stake': round(stake1, 2),
-                                        'team1_link': odds1.get('link', ''),
-                                        'team2_name': odds2['team'],
-                                        'team2_book': odds2['bookmaker'],
-                                        'team2_odds': self.decimal_to_american(odds2['price']),
-                                        'team2_point': odds2.get('point'),
-                                        'team2_stake': round(stake2, 2),
-                                        'team2_link': odds2.get('link', ''),
-                                        'hold_percentage': round(hold_percentage, 2),
-                                        'profit_percentage': profit_percentage
-                                    })
-        
-        # logger.info(f"Checking player props for {game['sport_key']} game: {game['home_team']} vs {game['away_team']}")
-        player_props = self.get_player_props(game['sport_key'], game['id'])
-        
-        if player_props:
-            prop_markets = self.process_player_props(player_props, game['sport_key'])
-            
-            for market_key, market_odds in prop_markets.items():
-                prop_type = market_odds[0]['prop_type']
-                player_name = market_odds[0]['player']
-                prop_readable = self.get_prop_description(prop_type, game['sport_key'])
-                
-                # logger.info(f"Analyzing {prop_readable} prop for {player_name}")
-                
-                odds_by_outcome = {}
-                for odds in market_odds:
-                    key = f"{odds['team']}_{odds['bookmaker']}_{odds.get('point', '')}"
-                    if key not in odds_by_outcome or odds['price'] > odds_by_outcome[key]['price']:
-                        odds_by_outcome[key] = odds
-                
-                processed_pairs = set()
-                for key1, odds1 in odds_by_outcome.items():
-                    for key2, odds2 in odds_by_outcome.items():
-                        if odds1['bookmaker'] == odds2['bookmaker']:
-                            continue
-                            
-                        if key1 != key2 and odds1['point'] == odds2['point']:
-                            if 'OVER' in odds1['team'].upper() and 'UNDER' in odds2['team'].upper():
-                                pair_key = tuple(sorted([key1, key2]))
-                                if pair_key not in processed_pairs:
-                                    processed_pairs.add(pair_key)
-                                    
-                                    prob1 = self.calculate_implied_probability(odds1['price'])
-                                    prob2 = self.calculate_implied_probability(odds2['price'])
-                                    total_prob = prob1 + prob2
-                                    
-                                    # logger.debug(f"""
-                                    #     Potential opportunity found:
-                                    #     Player: {player_name}
-                                    #     Prop: {prop_readable}
-                                    #     Book1: {odds1['bookmaker']} {odds1['team']} {odds1['point']} @ {odds1['price']} (prob: {prob1:.4f})
-                                    #     Book2: {odds2['bookmaker']} {odds2['team']} {odds2['point']} @ {odds2['price']} (prob: {prob2:.4f})
-                                    #     Total probability: {total_prob:.4f}
-                                    # """)
-                                    
-                                    if total_prob <= self.low_hold_threshold:
-                                        stake1, stake2 = self.calculate_kelly_percentage(
-                                            prob1, prob2, odds1['price'], odds2['price']
-                                        )
-                                        
-                                        hold_percentage = (total_prob - 1) * 100
-                                        opportunity_type = 'Arbitrage' if total_prob < 1 else 'Low Hold'
-                                        profit_percentage = round(((1 / total_prob) - 1) * 100, 2) if total_prob < 1 else 0
-                                        
-                                        # if profit_percentage > 10:
-                                        #     logger.warning(f"""
-                                        #         Suspiciously high profit percentage ({profit_percentage}%)!
-                                        #         Please verify this opportunity manually:
-                                        #         {player_name} {prop_readable}
-                                        #         {odds1['bookmaker']}: {odds1['team']} {odds1['point']} @ {odds1['price']}
-                                        #         {odds2['bookmaker']}: {odds2['team']} {odds2['point']} @ {odds2['price']}
-                                        #     """)
-                                        
-                                        prop_description = f"{player_name} - {prop_readable}"
-                                        
-                                        opportunities.append({
-                                            'sport': game['sport_title'],
-                                            'opportunity_type': opportunity_type,
-                                            'market_type': 'player_prop',
-                                            'prop_description': prop_description,
-                                            'market_point': odds1['point'],
-                                            'game': f"{game['home_team']} vs {game['away_team']}",
-                                            'commence_time': game['commence_time'],
-                                            'team1_name': f"{odds1['team']} ({odds1['point']})",
-                                            'team1_book': odds1['bookmaker'],
-                                            'team1_odds': self.decimal_to_american(odds1['price']),
-                                            'team1_point': odds1['point'],
-                                            'team1_stake': round(stake1, 2),
-                                            'team1_link': odds1['link'],
-                                            'team2_name': f"{odds2['team']} ({odds2['point']})",
-                                            'team2_book': odds2['bookmaker'],
-                                            'team2_odds': self.decimal_to_american(odds2['price']),
-                                            'team2_point': odds2['point'],
-                                            'team2_stake': round(stake2, 2),
-                                            'team2_link': odds2['link'],
-                                            'hold_percentage': round(hold_percentage, 2),
-                                            'profit_percentage': profit_percentage
-                                        })
-        
-        return opportunities
-
-    # In the find_arbitrage method, replace the spread validation with this improved version:
+    def find_opportunities(self, game, additional_odds=None, player_props=None):
+        """
+        Arbitrage and low-hold opportunities between US books for a game,
+        including player props (fetched when player_props is None).
+        """
+        if player_props is None:
+            player_props = self.get_player_props(game['sport_key'], game['id'])
+        return self.unified.detect_game(game, additional_odds, player_props, plus_ev=False)[0]
 
     def find_arbitrage(self, game, additional_odds=None):
-        """Find arbitrage opportunities in a single game with improved alternate market handling"""
-        arbitrage_opportunities = []
-        
-        # Combine standard and additional bookmakers
-        all_bookmakers = game['bookmakers']
-        if additional_odds:
-            all_bookmakers.extend(additional_odds)
-    
-        # Process each market type
-        all_markets = self.featured_markets + self.additional_markets
-        for market_type in all_markets:
-            markets = self.process_markets(all_bookmakers, market_type)
-            
-            # Process each specific market (including each alternate line)
-            for market_key, market_odds in markets.items():
-                # Group odds by team and point combination
-                odds_by_team = {}
-                for odds in market_odds:
-                    key = f"{odds['team']}_{odds.get('point', '')}"
-                    if key not in odds_by_team or odds['price'] > odds_by_team[key]['price']:
-                        odds_by_team[key] = odds
-                
-                # Find matching pairs for arbitrage
-                processed_pairs = set()
-                for key1, odds1 in odds_by_team.items():
-                    for key2, odds2 in odds_by_team.items():
-                        if key1 != key2:
-                            # Skip if same team
-                            if odds1['team'] == odds2['team']:
-                                continue
-                                
-                            # Validate spread matching
-                            if ('spreads' in market_type or 'alternate_spreads' in market_type):
-                                point1 = float(odds1.get('point', 0) or 0)
-                                point2 = float(odds2.get('point', 0) or 0)
-                                
-                                # Skip if points are not set
-                                if point1 == 0 or point2 == 0:
-                                    continue
-                                    
-                                # For spread bets, ensure the points are opposite and equal
-                                if abs(point1 + point2) > 0.1:  # Use 0.1 to account for floating point precision
-                                    # print(f"Checking spreads: {odds1['team']} {point1} vs {odds2['team']} {point2}")
-                                    continue
-                            
-                            # Validate totals matching
-                            if ('totals' in market_type or 'alternate_totals' in market_type):
-                                if odds1.get('point') != odds2.get('point'):
-                                    continue
-                            
-                            pair_key = tuple(sorted([key1, key2]))
-                            if pair_key not in processed_pairs:
-                                processed_pairs.add(pair_key)
-                                
-                                prob1 = self.calculate_implied_probability(odds1['price'])
-                                prob2 = self.calculate_implied_probability(odds2['price'])
-                                
-                                if prob1 + prob2 < 1:
-                                    stake1, stake2 = self.calculate_kelly_percentage(
-                                        prob1, prob2, odds1['price'], odds2['price']
-                                    )
-                                    
-                                    arbitrage_opportunities.append({
-                                        'sport': game['sport_title'],
-                                        'market_type': 'alternate_spreads' if 'alternate_spreads' in market_key 
-                                                       else 'alternate_totals' if 'alternate_totals' in market_key
-                                                       else market_key.split('_')[0],
-                                        'market_point': odds1.get('point'),
-                                        'game': f"{game['home_team']} vs {game['away_team']}",
-                                        'commence_time': game['commence_time'],
-                                        'team1_name': odds1['team'],
-                                        'team1_book': odds1['bookmaker'],
-                                        'team1_odds': self.decimal_to_american(odds1['price']),
-                                        'team1_point': odds1.get('point'),
-                                        'team1_stake': round(stake1, 2),
-                                        'team1_link': odds1.get('link', ''),  # Add link for first bet
-                                        'team2_name': odds2['team'],
-                                        'team2_book': odds2['bookmaker'],
-                                        'team2_odds': self.decimal_to_american(odds2['price']),
-                                        'team2_point': odds2.get('point'),
-                                        'team2_stake': round(stake2, 2),
-                                        'team2_link': odds2.get('link', ''),  # Add link for second bet
-                                        'profit_percentage': round(((1 / (prob1 + prob2)) - 1) * 100, 2)
-                                    })
-    
-        return arbitrage_opportunities
-
-    def find_plus_ev_bets(self, game, additional_odds=None):
-        """Find plus EV betting opportunities for moneylines and player props"""
-        plus_ev_opportunities = []
-        logging.basicConfig(level=logging.INFO)
-        logger = logging.getLogger('plus_ev_finder')
-        
-        all_bookmakers = game['bookmakers']
-        if additional_odds:
-            all_bookmakers.extend(additional_odds)
-            
-        # logger.info(f"\nAnalyzing game: {game['home_team']} vs {game['away_team']}")
-
-        # Check moneyline markets
-        markets = self.process_markets(all_bookmakers, 'h2h')
-        for market_key, market_odds in markets.items():
-            # Find Pinnacle odds
-            pinnacle_odds = []
-            for odds in market_odds:
-                if odds['bookmaker'].lower() == 'pinnacle':
-                    pinnacle_odds.append(odds)
-            
-            if not pinnacle_odds or len(pinnacle_odds) != 2:
-                continue
-            
-            # Sort Pinnacle odds by team name for consistency
-            pinnacle_odds.sort(key=lambda x: x['team'])
-            pinnacle_american = [self.decimal_to_american(odds['price']) for odds in pinnacle_odds]
-            
-            # logger.info(f"\nPinnacle moneyline odds:")
-            # logger.info(f"{pinnacle_odds[0]['team']}: {pinnacle_american[0]}")
-            # logger.info(f"{pinnacle_odds[1]['team']}: {pinnacle_american[1]}")
-            
-            # Calculate fair odds using power method
-            fair_odds = power_devig(pinnacle_american)
-            
-            # logger.info(f"Fair odds after devigging:")
-            # logger.info(f"{pinnacle_odds[0]['team']}: {fair_odds[0]}")
-            # logger.info(f"{pinnacle_odds[1]['team']}: {fair_odds[1]}")
-            
-            # Compare US books against fair odds
-            for odds in market_odds:
-                if odds['bookmaker'].lower() in [b.lower() for b in self.regions['us']]:
-                    american_odds = self.decimal_to_american(odds['price'])
-                    team_index = 0 if odds['team'] == pinnacle_odds[0]['team'] else 1
-                    fair_odd = fair_odds[team_index]
-                    
-                    # Only consider when book odds are better than fair odds
-                    if (american_odds > 0 and fair_odd > 0 and american_odds > fair_odd) or \
-                    (american_odds < 0 and fair_odd < 0 and american_odds > fair_odd) or \
-                    (american_odds > 0 and fair_odd < 0):
-                        
-                        # Calculate probabilities
-                        if american_odds > 0:
-                            implied_prob = 100 / (american_odds + 100)
-                        else:
-                            implied_prob = abs(american_odds) / (abs(american_odds) + 100)
-                            
-                        if fair_odd > 0:
-                            fair_prob = 100 / (fair_odd + 100)
-                        else:
-                            fair_prob = abs(fair_odd) / (abs(fair_odd) + 100)
-                        
-                        # Calculate EV
-                        if american_odds > 0:
-                            decimal_odds = (american_odds / 100) + 1
-                        else:
-                            decimal_odds = (100 / abs(american_odds)) + 1
-                        
-                        ev_percentage = (decimal_odds * fair_prob - 1) * 100
-                        
-                      
-                        
-                        if ev_percentage >= self.ev_threshold:
-                            logger.info(f"Found +EV opportunity!")
-                            plus_ev_opportunities.append({
-                                'sport': game['sport_title'],
-                                'market_type': 'Moneyline',
-                                'market_point': None,
-                                'game': f"{game['home_team']} vs {game['away_team']}",
-                                'commence_time': game['commence_time'],
-                                'team': odds['team'],
-                                'bookmaker': odds['bookmaker'],
-                                'odds': american_odds,
-                                'fair_odds': fair_odd,
-                                'ev_percentage': round(ev_percentage, 2),
-                                'link': odds.get('link', '')
-                            })
+        """Strict arbitrage in a game's featured and alternate markets across every book"""
+        opportunities = self.unified.detect_game(game, additional_odds, plus_ev=False, all_books=True)[0]
+        return [
+            {key: value for key, value in opportunity.items() if key not in ('opportunity_type', 'hold_percentage')}
+            for opportunity in opportunities if opportunity['opportunity_type'] == 'Arbitrage'
+        ]
 
-        # Check player props
-        try:
-            if game['id'] in self.all_player_props:
-                player_props = self.all_player_props[game['id']]['props']
-                
-                prop_markets = self.process_player_props(player_props, game['sport_key'])
-                
-                
-                for market_key, market_odds in prop_markets.items():
-                    # logger.info(f"\nAnalyzing market: {market_key}")
-                    if not market_odds:
-                        continue
-                        
-                    prop_type = market_odds[0]['prop_type']
-                    player_name = market_odds[0]['player']
-                    prop_readable = self.get_prop_description(prop_type, game['sport_key'])
-                    
-                    # Group by over/under and point
-                    over_odds = {}
-                    under_odds = {}
-                    pinnacle_odds = {'over': {}, 'under': {}}
-                    
-                    # First, find Pinnacle odds
-                    for odds in market_odds:
-                        if odds['bookmaker'].lower() == 'pinnacle':
-                            key = str(odds['point'])
-                            if 'OVER' in odds['team'].upper():
-                                pinnacle_odds['over'][key] = odds
-                            elif 'UNDER' in odds['team'].upper():
-                                pinnacle_odds['under'][key] = odds
-                    
-                    # Then process all odds
-                    for odds in market_odds:
-                        key = str(odds['point'])
-                        if 'OVER' in odds['team'].upper():
-                            if key not in over_odds or odds['price'] > over_odds[key]['price']:
-                                over_odds[key] = odds
-                        elif 'UNDER' in odds['team'].upper():
-                            if key not in under_odds or odds['price'] > under_odds[key]['price']:
-                                under_odds[key] = odds
-                    
-                    
-                    # Check each line where we have both Pinnacle odds
-                    common_points = set(pinnacle_odds['over'].keys()) & set(pinnacle_odds['under'].keys())
-                    for point in common_points:
-                        pin_over = pinnacle_odds['over'][point]
-                        pin_under = pinnacle_odds['under'][point]
-                        
-                        # Calculate fair odds
-                        pin_over_american = self.decimal_to_american(pin_over['price'])
-                        pin_under_american = self.decimal_to_american(pin_under['price'])
-                        fair_odds = power_devig([pin_over_american, pin_under_american])
-                        
-                        # logger.info(f"\nLine {point}: Pinnacle Over/Under {pin_over_american}/{pin_under_american}")
-                        # logger.info(f"Fair odds: {fair_odds[0]}/{fair_odds[1]}")
-                        
-                        # Check all books at this point
-                        for odds in market_odds:
-                            if odds['point'] != float(point) or odds['bookmaker'].lower() == 'pinnacle':
-                                continue
-                            
-                            if odds['bookmaker'].lower() in [b.lower() for b in self.regions['us']]:
-                                american_odds = self.decimal_to_american(odds['price'])
-                                is_over = 'OVER' in odds['team'].upper()
-                                fair_odd = fair_odds[0] if is_over else fair_odds[1]
-                                
-                                # Only consider when book odds are better than fair odds
-                                if (american_odds > 0 and fair_odd > 0 and american_odds > fair_odd) or \
-                                (american_odds < 0 and fair_odd < 0 and american_odds > fair_odd) or \
-                                (american_odds > 0 and fair_odd < 0):
-                                    
-                                    # Calculate EV
-                                    if american_odds > 0:
-                                        decimal_odds = (american_odds / 100) + 1
-                                    else:
-                                        decimal_odds = (100 / abs(american_odds)) + 1
-                                    
-                                    if fair_odd > 0:
-                                        fair_prob = 100 / (fair_odd + 100)
-                                    else:
-                                        fair_prob = abs(fair_odd) / (abs(fair_odd) + 100)
-                                    
-                                    ev_percentage = (decimal_odds * fair_prob - 1) * 100
-                                    
-                                    if ev_percentage >= self.ev_threshold:
-                                        logger.info(f"Found +EV prop: {odds['bookmaker']} {odds['team']} @ {american_odds}")
-                                        plus_ev_opportunities.append({
-                                            'sport': game['sport_title'],
-                                            'market_type': f"Player Prop - {prop_readable}",
-                                            'market_point': point,
-                                            'game': f"{game['home_team']} vs {game['away_team']}",
-                                            'commence_time': game['commence_time'],
-                                            'team': f"{player_name} {odds['team']}",
-                                            'bookmaker': odds['bookmaker'],
-                                            'odds': american_odds,
-                                            'fair_odds': fair_odd,
-                                            'ev_percentage': round(ev_percentage, 2),
-                                            'link': odds.get('link', '')
-                                        })
-                                        
-        except Exception as e:
-            logger.error(f"Error processing player props: {str(e)}", exc_info=True)
-            
-        return plus_ev_opportunities
+    def find_plus_ev_bets(self, game, additional_odds=None, player_props=None):
+        """
+        Find plus EV betting opportunities for moneylines and player props.
+        player_props defaults to the props stored for the game in all_player_props.
+        """
+        if player_props is None and game['id'] in self.all_player_props:
+            player_props = self.all_player_props[game['id']]['props']
+        return self.unified.detect_game(game, additional_odds, player_props, arbitrage=False)[1]
 
     def generate_plus_ev_html(self, opportunities):
         if not opportunities:
@@ -955,39 +557,216 @@ class OddsArbitrageFinder:
         
         return html
 
+    def fetch_event_data(self, games, plan=None):
+        """
+        Fetch player props and additional markets for a list of (sport, game) pairs,
+        at most two requests per event via get_event_markets.
+        Requests run on a pool of at most self.max_workers threads.
+        Requests are dispatched in the order of games.
+        With a CyclePlan, only its events are fetched, with its markets.
+        Returns a list of (props, additional_odds) tuples in the same order as games.
+        """
+        if not games:
+            return []
+        
+        def fetch(index):
+            sport, game = games[index]
+            if not self.has_us_coverage(game):
+                return [], []
+            if plan is None:
+                return self.get_event_markets(sport, game['id'])
+            if game['id'] not in planned_events:
+                return [], []
+            additional_markets, prop_markets = plan.get_markets(sport)
+            return self.get_event_markets(sport, game['id'], additional_markets, prop_markets)
+        
+        if plan is not None:
+            planned_events = plan.get_event_ids()
+        
+        if self.max_workers <= 1:
+            results = [fetch(index) for index in range(len(games))]
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                results = list(executor.map(fetch, range(len(games))))
+        return [(props, additional_odds) for additional_odds, props in results]
+
+    def get_due(self, keys):
+        """Scheduler keys due for a fetch this cycle, most overdue first; all of them without a scheduler"""
+        keys = list(keys)
+        return self.scheduler.pop_due(keys) if self.scheduler else keys
+
     def generate_arbitrage_table(self):
         print("Analyzing...")
         self.all_opportunities = []
         self.all_odds_data = []
         self.all_plus_ev = []
+        self.all_multiway = []
+        self.all_middles = []
         self.all_player_props = {}  # Reset player props
+        self.client.start_cycle()
+        self.metrics.start_cycle()
+        
+        budget = self.planner.get_cycle_budget()
+        sports = self.get_active_sports()
+        skipped_sports = len(self.sports) - len(sports)
+        if skipped_sports:
+            print(f"Skipping {skipped_sports} out-of-season sports")
+        self.metrics.set_gauge('odds_skipped_sports', skipped_sports, 'Out-of-season sports skipped in the last scan cycle')
+        
+        # Featured odds are refetched only for sports whose slate is due;
+        # the others reuse the odds from their last fetch
+        games = []
+        events_by_sport = {}
+        featured_spent = 0
+        due_sports = set(self.get_due(('featured', sport) for sport in sports))
+        for sport in sports:
+            if ('featured', sport) in due_sports:
+                with self.metrics.span('fetch_featured_odds', sport=sport):
+                    events = self.get_featured_odds(sport)
+                if events:
+                    featured_spent += len(self.featured_markets) * len(self.regions)
+                # An empty or failed fetch stays due for the next cycle
+                if events and self.scheduler:
+                    self.scheduler.record(
+                        ('featured', sport), min(game['commence_time'] for game in events), events,
+                        latest_update([bookmaker for game in events for bookmaker in game['bookmakers']])
+                    )
+            else:
+                events = self.scheduler.get_data(('featured', sport), [])
+            # Work on copies so nothing downstream can alter the stored slate
+            events_by_sport[sport] = [dict(game, bookmakers=list(game['bookmakers'])) for game in events]
+            games.extend((sport, game) for game in events_by_sport[sport])
+        
+        # Events no US book covers get no per-event fetches
+        covered_by_sport = {
+            sport: [game for game in events if self.has_us_coverage(game)]
+            for sport, events in events_by_sport.items()
+        }
+        skipped_events = len(games) - sum(len(events) for events in covered_by_sport.values())
+        self.metrics.set_gauge('odds_skipped_events', skipped_events, 'Events without US book coverage skipped in the last scan cycle')
+        
+        # Per-event markets are fetched for due events only, most overdue first
+        # (soonest first among events never fetched)
+        covered = sorted(
+            ((sport, game) for sport, events in covered_by_sport.items() for game in events),
+            key=lambda item: item[1]['commence_time']
+        )
+        covered_by_id = {game['id']: (sport, game) for sport, game in covered}
+        due_games = [covered_by_id[key[1]] for key in self.get_due(('event', game['id']) for _, game in covered)]
+        due_by_sport = {sport: [] for sport in covered_by_sport}
+        for sport, game in due_games:
+            due_by_sport[sport].append(game)
+        print(f"Due this cycle: {len(due_sports)}/{len(sports)} featured slates, {len(due_games)}/{len(covered)} events")
+        self.metrics.set_gauge('odds_due_events', len(due_games), 'Events due for a per-event fetch in the last scan cycle')
+        
+        # Fit the per-event work to the quota budget before spending it
+        plan = self.planner.plan(self, due_by_sport, budget, featured_spent)
+        if plan.dropped:
+            print('\n'.join(plan.describe()))
+        self.metrics.set_gauge('odds_cycle_planned_credits', plan.get_cost(), 'Quota the last cycle plan was estimated to spend')
+        
+        # Fetch the due events' props and additional markets up front, then
+        # run detection on the collected results in the original game order.
+        # Events left out of the plan stay due and keep their last data meanwhile
+        with self.metrics.span('fetch_event_data'):
+            fetched = self.fetch_event_data(due_games, plan)
+        planned_events = plan.get_event_ids()
+        fetched_by_id = {}
+        for (sport, game), (props, additional_odds) in zip(due_games, fetched):
+            if game['id'] in planned_events:
+                fetched_by_id[game['id']] = (props, additional_odds)
+                if self.scheduler:
+                    self.scheduler.record(('event', game['id']), game['commence_time'], (props, additional_odds),
+                                          latest_update(props + additional_odds))
+        event_data = [
+            fetched_by_id.get(game['id']) or (self.scheduler.get_data(('event', game['id']), ([], [])) if self.scheduler else ([], []))
+            for _, game in games
+        ]
         
-        for sport in self.sports:
-            featured_odds = self.get_featured_odds(sport)
+        if self.scheduler:
+            # Finished or removed events and out-of-season sports drop out of the schedule
+            self.scheduler.retain([('featured', sport) for sport in sports] + [('event', game['id']) for _, game in covered])
+            next_due = self.scheduler.get_next_due()
+            if next_due is not None:
+                self.metrics.set_gauge('odds_next_poll_seconds', next_due, 'Seconds until the next scheduled fetch comes due')
+        
+        detection_input = []
+        indexes = []
+        for (sport, game), (props, additional_odds) in zip(games, event_data):
+            # One pass over the game's quotes feeds the odds screen and every detector
+            with self.metrics.span('index_quotes', sport=sport, event=game['id']):
+                index = GameQuoteIndex(game, additional_odds, props)
+            with self.metrics.span('collect_all_odds', sport=sport, event=game['id']):
+                odds_data = self.collect_all_odds(game, index)
+            self.all_odds_data.extend(odds_data)
             
-            for game in featured_odds:
-                # Collect regular odds data
-                odds_data = self.collect_all_odds(game)
-                self.all_odds_data.extend(odds_data)
-                
-                # Fetch and store player props
-                props = self.get_player_props(game['sport_key'], game['id'])
-                if props:
-                    self.all_player_props[game['id']] = {
-                        'props': props,
-                        'game': game
-                    }
-                
-                # Process opportunities
-                additional_odds = self.get_event_odds(sport, game['id'])
-                opportunities = self.find_opportunities(game, additional_odds)
-                self.all_opportunities.extend(opportunities)
-                
-                plus_ev = self.find_plus_ev_bets(game)
-                self.all_plus_ev.extend(plus_ev)
-        
-        if self.all_opportunities:
-            df = pd.DataFrame(self.all_opportunities)
+            # Store player props
+            if props:
+                self.all_player_props[game['id']] = {
+                    'props': props,
+                    'game': game
+                }
+            
+            detection_input.append((game, additional_odds, props))
+            indexes.append(index)
+        
+        # Process opportunities
+        if self.incremental_detection:
+            with self.metrics.span('incremental_detection'):
+                opportunities_by_game, plus_ev_by_game = self.incremental.detect(detection_input, indexes)
+            stats = self.incremental.stats
+            print(f"Detection: {stats['changed']}/{stats['units']} markets changed and re-analyzed")
+            self.metrics.set_gauge('odds_detection_units', stats['units'], 'Markets (per player for props) analyzed in the last scan cycle')
+            self.metrics.set_gauge('odds_detection_changed_units', stats['changed'], 'Markets re-analyzed because their quotes changed in the last scan cycle')
+        else:
+            with self.metrics.span('unified_detection'):
+                opportunities_by_game, plus_ev_by_game = self.unified.detect(detection_input, indexes=indexes)
+        
+        for opportunities, plus_ev in zip(opportunities_by_game, plus_ev_by_game):
+            self.all_opportunities.extend(opportunities)
+            self.all_plus_ev.extend(plus_ev)
+        
+        # Lines with three or more outcomes are priced as a whole rather than in pairs
+        with self.metrics.span('multiway_detection'):
+            for opportunities in self.multiway.find_opportunities(detection_input, indexes):
+                self.all_multiway.extend(opportunities)
+        if self.all_multiway:
+            print(f"Multi-way: {len(self.all_multiway)} opportunities")
+        self.metrics.set_gauge('odds_multiway_opportunities', len(self.all_multiway), 'Multi-way arbitrage and low-hold opportunities in the last scan cycle')
+        
+        # Over/under and spread pairs at different lines, which the pairwise detectors never match
+        with self.metrics.span('middle_detection'):
+            for middles in self.middle_finder.find_middles(detection_input, indexes):
+                self.all_middles.extend(middles)
+        if self.all_middles:
+            print(f"Middles: {len(self.all_middles)} with estimated EV >= {self.middle_min_ev}%")
+        self.metrics.set_gauge('odds_middle_opportunities', len(self.all_middles), 'Middles found in the last scan cycle')
+        
+        self.planner.record_cycle(self, plan, self.all_opportunities + self.all_multiway, self.all_plus_ev)
+        if self.planner.remaining is not None:
+            self.metrics.set_gauge('odds_quota_remaining', self.planner.remaining, 'x-requests-remaining from the last Odds API response')
+        
+        memo_stats = self.client.get_memo_stats()
+        print(f"Request memo: {memo_stats['hits']} hits, {memo_stats['misses']} misses")
+        self.metrics.set_gauge('odds_request_memo_hits', memo_stats['hits'], 'Request memo hits in the last scan cycle')
+        self.metrics.set_gauge('odds_request_memo_misses', memo_stats['misses'], 'Request memo misses in the last scan cycle')
+        
+        cache_stats = self.client.get_cache_stats()
+        if cache_stats:
+            print(f"Response cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                  f"{cache_stats['revalidated']} revalidated, {cache_stats['quota_saved']} quota saved")
+            self.metrics.set_gauge('odds_response_cache_hit_rate', cache_stats['hit_rate'], 'Persistent response cache hit rate in the last scan cycle')
+            self.metrics.increment('odds_response_cache_hits_total', cache_stats['hits'], 'Requests served from the persistent response cache')
+            self.metrics.increment('odds_response_cache_misses_total', cache_stats['misses'], 'Requests the persistent response cache could not serve')
+            self.metrics.increment('odds_quota_saved_total', cache_stats['quota_saved'], 'Odds API quota not spent thanks to the response cache')
+        self.metrics.end_cycle()
+        
+        return self.build_arbitrage_table(self.all_opportunities)
+    
+    def build_arbitrage_table(self, opportunities):
+        """DataFrame of opportunity records in the arbitrage table's column order"""
+        if opportunities:
+            df = pd.DataFrame(opportunities)
             df['timestamp'] = datetime.now(timezone.utc)
             
             columns = [
@@ -998,7 +777,8 @@ class OddsArbitrageFinder:
                 'team2_name', 'team2_book', 'team2_odds', 'team2_point', 'team2_stake', 'team2_link',
                 'profit_percentage', 'timestamp'
             ]
-            return df[columns]
+            # reindex rather than select: a slate without prop opportunities has no prop_description column
+            return df.reindex(columns=columns)
         else:
             return pd.DataFrame(columns=[
                 'opportunity_type', 'hold_percentage', 
@@ -1009,18 +789,14 @@ class OddsArbitrageFinder:
                 'profit_percentage', 'timestamp'
             ])
         
-    def collect_all_odds(self, game):
+    def collect_all_odds(self, game, index=None):
         """Collect and organize all odds for the odds screen"""
         odds_data = []
-        
-        # Combine standard and additional bookmakers
-        all_bookmakers = game['bookmakers']
+        index = index or GameQuoteIndex(game)
         
         # Process each market type
         for market_type in self.featured_markets:
-            markets = self.process_markets(all_bookmakers, market_type)
-            
-            for market_key, market_odds in markets.items():
+            for _, quotes in index.get_lines(market_type):
                 # Create a standardized format for each market
                 market_data = {
                     'sport': game['sport_title'],
@@ -1033,16 +809,13 @@ class OddsArbitrageFinder:
                 
                 # Group odds by bookmaker
                 odds_by_bookmaker = {}
-                for odds in market_odds:
-                    book = odds['bookmaker']
-                    if book not in odds_by_bookmaker:
-                        odds_by_bookmaker[book] = []
-                    odds_by_bookmaker[book].append({
-                        'team': odds['team'],
-                        'price': odds['price'],
-                        'point': odds.get('point'),
-                        'american_odds': self.decimal_to_american(odds['price']),
-                        'link': odds.get('link', '')
+                for quote in quotes:
+                    odds_by_bookmaker.setdefault(quote.bookmaker, []).append({
+                        'team': quote.team,
+                        'price': quote.price,
+                        'point': quote.point,
+                        'american_odds': self.decimal_to_american(quote.price),
+                        'link': quote.link
                     })
                 
                 market_data['books'] = odds_by_bookmaker
@@ -1054,6 +827,9 @@ class OddsArbitrageFinder:
         if df.empty:
             return """<div class="no-opps">No opportunities found.</div>"""
         
+        parse_cache = self.url_generator.parse_cache
+        parse_cache.start_cycle()
+        
         df['display_market'] = df.apply(
             lambda x: x.get('prop_description', x['market_type']) 
             if x['market_type'] == 'player_prop' 
@@ -1089,7 +865,11 @@ class OddsArbitrageFinder:
                     <th>Profit%</th>
                 </tr>"""
         
-        for _, row in df.iterrows():
+        # Links are only parsed here, for rows that are shown, each distinct link once and memoized across renders
+        links1 = self.url_generator.parse_urls(df['team1_link'])
+        links2 = self.url_generator.parse_urls(df['team2_link'])
+        
+        for (_, row), (book1_name, params1), (book2_name, params2) in zip(df.iterrows(), links1, links2):
             row_class = 'arbitrage' if row['opportunity_type'] == 'Arbitrage' else 'low-hold'
             badge_class = 'arbitrage-badge' if row['opportunity_type'] == 'Arbitrage' else 'low-hold-badge'
             profit_class = 'profit-positive' if row['profit_percentage'] > 0 else 'profit-zero'
@@ -1100,9 +880,6 @@ class OddsArbitrageFinder:
             odds1_class = 'odds-negative' if row['team1_odds'] < 0 else 'odds-positive'
             odds2_class = 'odds-negative' if row['team2_odds'] < 0 else 'odds-positive'
             
-            book1_name, params1 = self.url_generator.parse_existing_url(row['team1_link'])
-            book2_name, params2 = self.url_generator.parse_existing_url(row['team2_link'])
-            
             book1_link = row['team1_link']
             book2_link = row['team2_link']
             
@@ -1164,6 +941,14 @@ class OddsArbitrageFinder:
             </div>
         </div>"""
         
+        parse_stats = parse_cache.get_stats()
+        print(f"Betslip links: {parse_stats['parses']} parsed, {parse_stats['hits']} cached, "
+              f"{parse_stats['evictions']} evicted, {parse_stats['size']} held")
+        self.metrics.increment('odds_link_parses_total', parse_stats['parses'], 'Betslip links parsed while rendering opportunities')
+        self.metrics.increment('odds_link_parse_cache_hits_total', parse_stats['hits'], 'Betslip links served from the parse cache')
+        self.metrics.set_gauge('odds_link_parse_cache_hit_rate', parse_stats['hit_rate'], 'Betslip link parse cache hit rate in the last render')
+        self.metrics.set_gauge('odds_link_parse_cache_size', parse_stats['size'], 'Parsed betslip links held in the cache')
+        
         return html
 
     def generate_plus_ev_html(self, opportunities):
@@ -1211,6 +996,110 @@ class OddsArbitrageFinder:
         
         return html
     
+    def generate_multiway_html(self, opportunities):
+        if not opportunities:
+            return ""
+        
+        html = """
+        <div class="container">
+            <h2>Multi-way</h2>
+            <table id="multiway-table">
+                <tr>
+                    <th>Type</th>
+                    <th>Hold%</th>
+                    <th>Sport</th>
+                    <th>Market</th>
+                    <th>Point</th>
+                    <th>Game</th>
+                    <th>Time</th>
+                    <th>Legs (outcome @ book, odds, stake)</th>
+                    <th>Profit%</th>
+                </tr>"""
+        
+        for opp in sorted(opportunities, key=lambda x: x['hold_percentage']):
+            row_class = 'arbitrage' if opp['opportunity_type'] == 'Arbitrage' else 'low-hold'
+            badge_class = 'arbitrage-badge' if opp['opportunity_type'] == 'Arbitrage' else 'low-hold-badge'
+            profit_class = 'profit-positive' if opp['profit_percentage'] > 0 else 'profit-zero'
+            legs = '<br>'.join(
+                f"""{leg['name']} @ <a href="{leg['link']}" target="_blank" class="betslip-link">{leg['book']}</a>, """
+                f"""<span class="{'odds-negative' if leg['odds'] < 0 else 'odds-positive'}">{leg['odds']}</span>, """
+                f"""<span class="stake">{leg['stake']:.1f}%</span>"""
+                for leg in opp['legs']
+            )
+            
+            html += f"""
+                <tr class="{row_class}">
+                    <td><span class="type-badge {badge_class}">{opp['opportunity_type']}</span></td>
+                    <td>{opp['hold_percentage']:.2f}%</td>
+                    <td>{opp['sport']}</td>
+                    <td>{opp['market_type']}</td>
+                    <td>{opp['market_point'] if opp['market_point'] is not None else '-'}</td>
+                    <td>{opp['game']}</td>
+                    <td>{opp['commence_time']}</td>
+                    <td>{legs}</td>
+                    <td class="{profit_class}">{opp['profit_percentage']:.2f}%</td>
+                </tr>"""
+        
+        html += """
+            </table>
+        </div>"""
+        
+        return html
+    
+    def generate_middles_html(self, middles):
+        if not middles:
+            return ""
+        
+        html = """
+        <div class="container">
+            <h2>Middles</h2>
+            <table id="middles-table">
+                <tr>
+                    <th>EV%</th>
+                    <th>Sport</th>
+                    <th>Market</th>
+                    <th>Game</th>
+                    <th>Time</th>
+                    <th>Low Side</th>
+                    <th>High Side</th>
+                    <th>Gap</th>
+                    <th>Middle%</th>
+                    <th>Miss%</th>
+                    <th>Hit%</th>
+                </tr>"""
+        
+        for middle in sorted(middles, key=lambda x: x['ev_percentage'], reverse=True):
+            legs = []
+            for side in ('team1', 'team2'):
+                odds = middle[f'{side}_odds']
+                legs.append(
+                    f"""{middle[f'{side}_name']} {middle[f'{side}_point']} @ """
+                    f"""<a href="{middle[f'{side}_link']}" target="_blank" class="betslip-link">{middle[f'{side}_book']}</a>, """
+                    f"""<span class="{'odds-negative' if odds < 0 else 'odds-positive'}">{odds}</span>, """
+                    f"""<span class="stake">{middle[f'{side}_stake']:.1f}%</span>"""
+                )
+            
+            html += f"""
+                <tr>
+                    <td class="ev-positive">{middle['ev_percentage']:.2f}%</td>
+                    <td>{middle['sport']}</td>
+                    <td>{middle.get('prop_description', middle['market_type'])}</td>
+                    <td>{middle['game']}</td>
+                    <td>{middle['commence_time']}</td>
+                    <td>{legs[0]}</td>
+                    <td>{legs[1]}</td>
+                    <td>{middle['gap']} ({middle['middle_numbers']})</td>
+                    <td>{middle['middle_probability']:.1f}%</td>
+                    <td>{middle['miss_percentage']:.2f}%</td>
+                    <td>{middle['hit_percentage']:.2f}%</td>
+                </tr>"""
+        
+        html += """
+            </table>
+        </div>"""
+        
+        return html
+    
     def remove_vig(self, odds1, odds2):
         if odds1 < 0:
             dec1 = 1 - (100 / odds1)
@@ -1783,7 +1672,8 @@ class OddsArbitrageFinder:
                 
             </div>"""
             
-        opportunities_content = self.generate_opportunities_html(df)
+        opportunities_content = self.generate_opportunities_html(df) + self.generate_multiway_html(self.all_multiway) + \
+            self.generate_middles_html(self.all_middles)
         plus_ev_content = self.generate_plus_ev_html(self.all_plus_ev)
         odds_screen_content = self.generate_odds_screen_html(self.all_odds_data)
         
@@ -2113,7 +2003,8 @@ def main():
     arbitrage_table = arbitrage_finder.generate_arbitrage_table()
     
     # Generate HTML
-    html_content = arbitrage_finder.generate_html(arbitrage_table)
+    with metrics.span('generate_html'):
+        html_content = arbitrage_finder.generate_html(arbitrage_table)
     
     # Save HTML file
     html_filename = "arbitrage_opportunities.html"
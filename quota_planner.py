@@ -0,0 +1,271 @@
+import os
+import time
+import argparse
+import threading
+from collections import deque
+from datetime import datetime, timedelta, timezone
+
+
+def sport_name(sport):
+    """Short sport name used to key OddsArbitrageFinder.player_props"""
+    return sport.upper().split('_')[1] if '_' in sport else sport.upper()
+
+
+def event_cost(additional_markets, prop_markets):
+    """Quota for one get_event_markets call: additional markets on us, props on us,eu"""
+    return len(additional_markets) + 2 * len(prop_markets)
+
+
+class CyclePlan:
+    """
+    The per-event work one scan cycle will do and what it costs.
+    sports maps a sport key to its events (soonest first), the additional
+    and prop markets to request for them, and how many of those events get
+    per-event fetches at all. dropped lists what was trimmed to fit.
+    """
+    def __init__(self, featured_cost, budget=None):
+        self.featured_cost = featured_cost
+        self.budget = budget
+        self.sports = {}
+        self.dropped = []
+
+    def add_sport(self, sport, events, additional_markets, prop_markets):
+        self.sports[sport] = {
+            'events': sorted(events, key=lambda event: event['commence_time']),
+            'additional': list(additional_markets),
+            'props': list(prop_markets),
+            'event_limit': len(events)
+        }
+
+    def get_sport_cost(self, sport):
+        work = self.sports[sport]
+        return work['event_limit'] * event_cost(work['additional'], work['props'])
+
+    def get_cost(self):
+        return self.featured_cost + sum(self.get_sport_cost(sport) for sport in self.sports)
+
+    def get_markets(self, sport):
+        """(additional markets, prop markets) to request for an event of this sport"""
+        work = self.sports.get(sport)
+        if work is None:
+            return [], []
+        return work['additional'], work['props']
+
+    def get_event_ids(self):
+        """Ids of every event that gets a per-event fetch"""
+        return {
+            event['id']
+            for work in self.sports.values()
+            for event in work['events'][:work['event_limit']]
+            if work['additional'] or work['props']
+        }
+
+    def describe(self):
+        lines = []
+        budget = f"{self.budget:.0f}" if self.budget is not None else "unlimited"
+        lines.append(f"Cycle plan: {self.get_cost()} credits (budget {budget}, featured odds {self.featured_cost})")
+        for sport, work in self.sports.items():
+            lines.append(
+                f"  {sport}: {work['event_limit']}/{len(work['events'])} events x "
+                f"{event_cost(work['additional'], work['props'])} credits = {self.get_sport_cost(sport)}"
+                f" | additional: {', '.join(work['additional']) or '-'}"
+                f" | props: {', '.join(work['props']) or '-'}"
+            )
+        for sport, what, saved in self.dropped:
+            lines.append(f"  dropped {sport} {what} (saves {saved})")
+        return lines
+
+
+class QuotaPlanner:
+    """
+    Fits each scan cycle to an hourly Odds API quota budget.
+
+    observe() reads the x-requests-* headers from every network response to
+    track the remaining quota and what was spent over the last hour. plan()
+    estimates a cycle's cost from the featured odds and per-event markets
+    (markets x regions per call) and, when it exceeds the cycle's share of
+    the hourly budget, drops the lowest-yield prop markets first, then
+    alternate markets, then per-event fetches for the games furthest out.
+    Yields are opportunities found per credit, smoothed over past cycles.
+    """
+    def __init__(self, hourly_budget=None, cycle_interval=300, smoothing=0.3):
+        self.hourly_budget = hourly_budget
+        self.cycle_interval = cycle_interval
+        self.smoothing = smoothing
+        self.lock = threading.Lock()
+        self.spent = deque()
+        self.remaining = None
+        self.used = None
+        self.yields = {}
+
+    def observe(self, response):
+        """Record quota headers from an Odds API response"""
+        headers = response.headers
+        now = time.time()
+        with self.lock:
+            try:
+                if 'x-requests-remaining' in headers:
+                    self.remaining = float(headers['x-requests-remaining'])
+                if 'x-requests-used' in headers:
+                    self.used = float(headers['x-requests-used'])
+                if 'x-requests-last' in headers:
+                    self.spent.append((now, float(headers['x-requests-last'])))
+            except ValueError:
+                pass
+
+    def get_spent_last_hour(self):
+        cutoff = time.time() - 3600
+        with self.lock:
+            while self.spent and self.spent[0][0] < cutoff:
+                self.spent.popleft()
+            return sum(cost for _, cost in self.spent)
+
+    def get_cycle_budget(self):
+        """Credits the next cycle may spend, or None when unbounded"""
+        budgets = []
+        if self.hourly_budget is not None:
+            share = self.hourly_budget * self.cycle_interval / 3600
+            budgets.append(min(share, self.hourly_budget - self.get_spent_last_hour()))
+        if self.remaining is not None:
+            budgets.append(self.remaining)
+        return max(min(budgets), 0) if budgets else None
+
+    def get_yield(self, sport, market):
+        # Markets never measured sort last to drop, so new markets get a chance to prove themselves
+        return self.yields.get((sport_name(sport), market), float('inf'))
+
+    def plan(self, finder, events_by_sport, budget=None, featured_spent=None):
+        """
+        Build a CyclePlan for events_by_sport ({sport: [events]}). featured_spent
+        is the quota the featured odds already cost this cycle, when fetched.
+        """
+        if featured_spent is None:
+            featured_spent = sum(
+                len(finder.featured_markets) * len(finder.regions)
+                for events in events_by_sport.values() if events
+            )
+        plan = CyclePlan(featured_spent, budget)
+        for sport, events in events_by_sport.items():
+            if events:
+                plan.add_sport(sport, events, finder.get_additional_markets(sport),
+                               finder.player_props.get(sport_name(sport), []))
+
+        if budget is None or plan.get_cost() <= budget:
+            return plan
+
+        # Lowest-yield prop markets go first, then alternate markets
+        for kind in ('props', 'additional'):
+            candidates = sorted(
+                ((self.get_yield(sport, market), index, sport, market)
+                 for sport, work in plan.sports.items()
+                 for index, market in enumerate(work[kind])),
+                key=lambda item: (item[0], -item[1])
+            )
+            for _, _, sport, market in candidates:
+                if plan.get_cost() <= budget:
+                    return self.restore(plan, budget)
+                before = plan.get_cost()
+                plan.sports[sport][kind].remove(market)
+                plan.dropped.append((sport, market, before - plan.get_cost()))
+        if plan.get_cost() <= budget:
+            return self.restore(plan, budget)
+
+        # Then per-event fetches for the games furthest from starting
+        while plan.get_cost() > budget:
+            latest = max(
+                (sport for sport, work in plan.sports.items() if work['event_limit']),
+                key=lambda sport: plan.sports[sport]['events'][plan.sports[sport]['event_limit'] - 1]['commence_time'],
+                default=None
+            )
+            if latest is None:
+                break
+            before = plan.get_cost()
+            work = plan.sports[latest]
+            work['event_limit'] -= 1
+            plan.dropped.append((latest, f"event {work['events'][work['event_limit']]['id']}", before - plan.get_cost()))
+        return plan
+
+    def restore(self, plan, budget):
+        """
+        Put back dropped markets that fit again. A prop market costs twice
+        what an additional market does, so the last drop can free more than
+        was needed.
+        """
+        for entry in reversed(plan.dropped[:-1]):
+            sport, market, _ = entry
+            kind = 'props' if market.startswith('player_') else 'additional'
+            plan.sports[sport][kind].append(market)
+            if plan.get_cost() <= budget:
+                plan.dropped.remove(entry)
+            else:
+                plan.sports[sport][kind].remove(market)
+        return plan
+
+    def record_cycle(self, finder, plan, opportunities, plus_ev):
+        """Update per-market yields from the opportunities a planned cycle produced"""
+        readable = {}
+        for sport, work in plan.sports.items():
+            name = sport_name(sport)
+            for market in work['props']:
+                readable[(name, finder.get_prop_description(market.replace('player_', ''), name))] = market
+
+        found = {}
+        for record in list(opportunities) + list(plus_ev):
+            market = record.get('market_type', '')
+            if market == 'player_prop':
+                market = readable.get((record['sport'], record.get('prop_description', '').rsplit(' - ', 1)[-1]))
+            elif market.startswith('Player Prop - '):
+                market = readable.get((record['sport'], market[len('Player Prop - '):]))
+            if market:
+                found[(record['sport'], market)] = found.get((record['sport'], market), 0) + 1
+
+        with self.lock:
+            for sport, work in plan.sports.items():
+                events = work['event_limit']
+                if not events:
+                    continue
+                for market in work['additional'] + work['props']:
+                    key = (sport_name(sport), market)
+                    regions = 2 if market in work['props'] else 1
+                    current = found.get(key, 0) / (events * regions)
+                    previous = self.yields.get(key)
+                    self.yields[key] = current if previous is None else \
+                        self.smoothing * current + (1 - self.smoothing) * previous
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Print the quota plan for a scan cycle without fetching any odds')
+    parser.add_argument('--budget', type=float, default=os.getenv('ODDS_API_HOURLY_BUDGET'),
+                        help='hourly quota budget (default ODDS_API_HOURLY_BUDGET, else unlimited)')
+    parser.add_argument('--interval', type=int, default=int(os.getenv('REFRESH_INTERVAL', 60)),
+                        help='seconds between scan cycles')
+    parser.add_argument('--events', type=int, default=10, help='assumed events per sport')
+    parser.add_argument('--count-events', action='store_true',
+                        help='count events with the /events endpoint, which costs no quota')
+    args = parser.parse_args()
+
+    from odds_arbitrage_finder import OddsArbitrageFinder
+    finder = OddsArbitrageFinder(os.getenv('ODDS_API_KEY'))
+    planner = QuotaPlanner(float(args.budget) if args.budget else None, args.interval)
+
+    start = datetime.now(timezone.utc)
+    events_by_sport = {}
+    for sport in finder.get_active_sports() if args.count_events else finder.sports:
+        if args.count_events:
+            events_by_sport[sport] = finder.get_events(sport)
+        else:
+            events_by_sport[sport] = [
+                {'id': f"{sport}-{index}", 'commence_time': (start + timedelta(hours=index)).strftime('%Y-%m-%dT%H:%M:%SZ')}
+                for index in range(args.events)
+            ]
+
+    plan = planner.plan(finder, events_by_sport, planner.get_cycle_budget())
+    for line in plan.describe():
+        print(line)
+    cycles_per_hour = 3600 / args.interval
+    print(f"At one cycle every {args.interval}s: {plan.get_cost() * cycles_per_hour:.0f} credits/hour, "
+          f"{plan.get_cost() * cycles_per_hour * 24 * 30:.0f} credits/month")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+import gzip
+import json
+import time
+import atexit
+import logging
+import threading
+from urllib.parse import urlencode, urlparse
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+# Params left out of archive keys: the secret, and the cycle's own timestamp
+VOLATILE_PARAMS = {'apiKey', 'commenceTimeFrom'}
+
+# Response headers worth keeping alongside the body
+KEPT_HEADERS = ['content-type', 'x-requests-remaining', 'x-requests-used', 'x-requests-last', 'retry-after']
+
+
+def endpoint_path(url):
+    """Endpoint below /v4/sports, e.g. /basketball_nba/odds; the sports list itself is /sports"""
+    path = urlparse(url).path.rstrip('/')
+    if '/sports/' in path:
+        return '/' + path.split('/sports/', 1)[1]
+    return '/sports'
+
+
+def request_key(path, params):
+    """Archive key for a request: endpoint path plus sorted params, without volatile ones"""
+    query = urlencode(sorted((k, str(v)) for k, v in (params or {}).items() if k not in VOLATILE_PARAMS))
+    return f"{path}?{query}" if query else path
+
+
+def request_cost(path, params):
+    """Quota the Odds API charges for a request: markets x regions for odds endpoints, nothing otherwise"""
+    if not path.endswith('/odds'):
+        return 0
+    markets = [m for m in (params or {}).get('markets', 'h2h').split(',') if m]
+    regions = [r for r in (params or {}).get('regions', 'us').split(',') if r]
+    return max(len(markets), 1) * max(len(regions), 1)
+
+
+class ArchivedResponse:
+    """Enough of requests.Response for the finder to consume a replayed body"""
+    def __init__(self, url, status_code, body, headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.text = body
+        self.content = body.encode('utf-8')
+        self.headers = CaseInsensitiveDict(headers or {})
+
+    def json(self):
+        return json.loads(self.text)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} replayed for {self.url}", response=self)
+
+
+class ResponseRecorder:
+    """
+    Appends every raw response to a gzip-compressed JSON lines archive.
+    Each record carries the endpoint, params (without apiKey), request key,
+    scan cycle, timestamp, status, quota headers and the body as received.
+    Every cycle is written as its own complete gzip member, closed when the
+    next cycle starts or the process exits, so a live process that is never
+    closed still leaves a readable archive.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = None
+        self.cycle = time.time()
+        atexit.register(self.close)
+
+    def start_cycle(self):
+        with self.lock:
+            self.close_member()
+            self.cycle = time.time()
+
+    def close_member(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def write(self, url, params, response):
+        path = endpoint_path(url)
+        params = {k: str(v) for k, v in (params or {}).items() if k != 'apiKey'}
+        record = {
+            'key': request_key(path, params),
+            'endpoint': path,
+            'params': params,
+            'cycle': self.cycle,
+            'timestamp': time.time(),
+            'status': response.status_code,
+            'headers': {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+            'body': response.text
+        }
+        line = json.dumps(record, separators=(',', ':'))
+        with self.lock:
+            if self.file is None:
+                self.file = gzip.open(self.path, 'at', encoding='utf-8')
+            self.file.write(line + '\n')
+
+    def close(self):
+        with self.lock:
+            self.close_member()
+
+
+class ResponseReplayer:
+    """
+    Serves responses from a recorded archive instead of the network.
+    Cycles replay in recorded order: start_cycle() moves to the next one, and
+    a request the current cycle never made falls back to the latest earlier
+    recording of it. Anything never recorded comes back as a 404. An archive
+    cut short by a crash keeps every record before the damage.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.cycles = []
+        self.records = []
+        self.position = -1
+        self.latest = {}
+        self.lock = threading.Lock()
+
+        by_cycle = {}
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        by_cycle.setdefault(record['cycle'], {})[record['key']] = record
+        except (EOFError, ValueError, gzip.BadGzipFile) as e:
+            # A truncated final gzip member, or the line it cut off
+            logging.getLogger('response_archive').warning(f"{path} is truncated ({e}), replaying the records before it")
+        for cycle in sorted(by_cycle):
+            self.cycles.append(cycle)
+            self.records.append(by_cycle[cycle])
+
+    def start_cycle(self):
+        """Advance to the next recorded cycle; returns False once the archive is exhausted"""
+        with self.lock:
+            if self.position + 1 >= len(self.records):
+                return False
+            self.position += 1
+            self.latest.update(self.records[self.position])
+            return True
+
+    def get_record(self, key):
+        with self.lock:
+            if self.position < 0 and self.records:
+                self.position = 0
+                self.latest.update(self.records[0])
+            return self.latest.get(key)
+
+    def get(self, url, params=None):
+        record = self.get_record(request_key(endpoint_path(url), params))
+        if record is None:
+            return ArchivedResponse(url, 404, json.dumps({'message': 'Not in archive'}))
+        return ArchivedResponse(url, record['status'], record['body'], record['headers'])
+
+    def latest_payloads(self):
+        """{key: decoded body} of the latest successful response per request, across every cycle"""
+        payloads = {}
+        for records in self.records:
+            for key, record in records.items():
+                if record['status'] == 200:
+                    payloads[key] = json.loads(record['body'])
+        return payloads
@@ -0,0 +1,223 @@
+import json
+import time
+import zlib
+import sqlite3
+import threading
+from datetime import datetime
+from urllib.parse import urlparse
+from response_archive import ArchivedResponse, endpoint_path, request_key, request_cost
+
+
+# (seconds until the soonest game starts, TTL) checked in order; games closer
+# than the last tier, or already live, are never served from cache
+DEFAULT_TTL_TIERS = [
+    (7 * 24 * 3600, 3600),
+    (48 * 3600, 1800),
+    (24 * 3600, 900),
+    (6 * 3600, 300),
+    (2 * 3600, 120)
+]
+
+# TTLs for endpoints that carry no odds
+ENDPOINT_TTLS = {'sports': 3600, 'events': 600}
+
+
+def parse_commence_time(value):
+    return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
+
+class ResponseCache:
+    """
+    Persistent SQLite cache of successful Odds API responses.
+
+    Entries are keyed by host, endpoint and params (see request_key) and
+    expire on a TTL chosen from the soonest commence_time in the body, so
+    games days away are refetched rarely and games about to start are not
+    cached at all. Stale entries carrying an ETag or Last-Modified are
+    revalidated with a conditional request. Total stored bytes are capped
+    with least-recently-used eviction. Hits, misses and the quota they
+    saved are counted per cycle and since the cache was opened.
+    """
+    def __init__(self, path, max_bytes=256 * 2 ** 20, ttl_tiers=DEFAULT_TTL_TIERS, endpoint_ttls=ENDPOINT_TTLS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_tiers = ttl_tiers
+        self.endpoint_ttls = endpoint_ttls
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                endpoint TEXT,
+                status INTEGER,
+                headers TEXT,
+                body BLOB,
+                size INTEGER,
+                cost INTEGER,
+                stored_at REAL,
+                expires_at REAL,
+                last_access REAL
+            )""")
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)")
+        self.db.commit()
+        self.cycle_stats = self.empty_stats()
+        self.total_stats = self.empty_stats()
+
+    @staticmethod
+    def empty_stats():
+        return {'hits': 0, 'misses': 0, 'revalidated': 0, 'stores': 0, 'evictions': 0, 'quota_saved': 0}
+
+    def start_cycle(self):
+        with self.lock:
+            self.cycle_stats = self.empty_stats()
+
+    def count(self, name, amount=1):
+        self.cycle_stats[name] += amount
+        self.total_stats[name] += amount
+
+    def get_stats(self, cycle=True):
+        """Counters for the current cycle (or since opening) with the hit rate"""
+        with self.lock:
+            stats = dict(self.cycle_stats if cycle else self.total_stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+    def get_key(self, url, params):
+        return urlparse(url).netloc + request_key(endpoint_path(url), params)
+
+    def get_ttl(self, endpoint, body):
+        """Seconds a response may be served, from the endpoint and its soonest game"""
+        kind = endpoint.rstrip('/').rsplit('/', 1)[-1]
+        if kind in self.endpoint_ttls:
+            return self.endpoint_ttls[kind]
+
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return 0
+        events = data if isinstance(data, list) else [data]
+        starts = [parse_commence_time(event['commence_time'])
+                  for event in events if isinstance(event, dict) and event.get('commence_time')]
+        if not starts:
+            # An empty slate means nothing is scheduled, which changes as slowly as the events list
+            return self.endpoint_ttls.get('events', 0) if data == [] else 0
+
+        until_start = min(starts) - time.time()
+        for threshold, ttl in self.ttl_tiers:
+            if until_start >= threshold:
+                return ttl
+        return 0
+
+    def lookup(self, url, params):
+        """
+        Return (response, conditional_headers). response is a fresh cached
+        response or None; conditional_headers are set when a stale entry can
+        be revalidated instead of refetched.
+        """
+        key = self.get_key(url, params)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute(
+                "SELECT status, headers, body, cost, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.count('misses')
+                return None, None
+
+            status, headers, body, cost, expires_at = row
+            headers = json.loads(headers)
+            if expires_at > now:
+                # Commit the touch at once: an open write transaction would lock out other processes.
+                # It only orders eviction, so a hit is still served when another process holds the lock
+                try:
+                    self.db.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                    self.db.commit()
+                except sqlite3.Error:
+                    self.db.rollback()
+                self.count('hits')
+                self.count('quota_saved', cost)
+                return ArchivedResponse(url, status, zlib.decompress(body).decode('utf-8'), headers), None
+
+            self.count('misses')
+            conditional = {}
+            if headers.get('etag'):
+                conditional['If-None-Match'] = headers['etag']
+            if headers.get('last-modified'):
+                conditional['If-Modified-Since'] = headers['last-modified']
+            return None, conditional or None
+
+    def revalidated(self, url, params):
+        """A conditional request came back 304: extend the entry and return it"""
+        key = self.get_key(url, params)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute(
+                "SELECT endpoint, status, headers, body, cost FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            endpoint, status, headers, body, cost = row
+            text = zlib.decompress(body).decode('utf-8')
+            ttl = self.get_ttl(endpoint, text)
+            try:
+                self.db.execute("UPDATE responses SET expires_at = ?, last_access = ? WHERE key = ?", (now + ttl, now, key))
+                self.db.commit()
+            except sqlite3.Error:
+                self.db.rollback()
+                raise
+            self.count('revalidated')
+        return ArchivedResponse(url, status, text, json.loads(headers))
+
+    def store(self, url, params, response):
+        """Cache a 200 response if its TTL allows, evicting least recently used entries over max_bytes"""
+        if response.status_code != 200:
+            return
+        endpoint = endpoint_path(url)
+        ttl = self.get_ttl(endpoint, response.text)
+        if ttl <= 0:
+            return
+
+        # Quota headers describe the original request, so they are not replayed on hits
+        headers = {name.lower(): value for name, value in response.headers.items()
+                   if name.lower() in ('content-type', 'etag', 'last-modified')}
+        try:
+            cost = int(response.headers['x-requests-last'])
+        except (KeyError, ValueError):
+            cost = request_cost(endpoint, params)
+        body = zlib.compress(response.text.encode('utf-8'))
+        now = time.time()
+
+        with self.lock:
+            try:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (self.get_key(url, params), endpoint, response.status_code, json.dumps(headers),
+                     body, len(body), cost, now, now + ttl, now)
+                )
+                self.evict()
+                self.db.commit()
+            except sqlite3.Error:
+                self.db.rollback()
+                raise
+            self.count('stores')
+
+    def evict(self):
+        total = self.db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self.db.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            self.db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            self.count('evictions')
+
+    def clear(self):
+        with self.lock:
+            self.db.execute("DELETE FROM responses")
+            self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,262 @@
+import random
+import zlib
+from datetime import datetime, timedelta, timezone
+
+
+# Bookmaker titles per Odds API region, matching OddsArbitrageFinder.regions
+REGION_BOOKS = {
+    'us': ['BetMGM', 'BetRivers', 'Caesars', 'DraftKings', 'FanDuel'],
+    'eu': ['Pinnacle']
+}
+
+SPORT_TITLES = {
+    'americanfootball_ncaaf': 'NCAAF',
+    'basketball_ncaab': 'NCAAB',
+    'basketball_nba': 'NBA',
+    'icehockey_nhl': 'NHL',
+    'americanfootball_nfl': 'NFL'
+}
+
+# Main spread choices, total range and alternate line step per sport
+SPORT_LINES = {
+    'americanfootball_ncaaf': ([2.5, 3.5, 6.5, 7.5, 10.5, 14.5, 21.5], (41.5, 65.5), 1.0),
+    'basketball_ncaab': ([1.5, 3.5, 5.5, 7.5, 9.5, 12.5], (128.5, 160.5), 1.0),
+    'basketball_nba': ([1.5, 3.5, 5.5, 7.5, 9.5], (208.5, 240.5), 1.0),
+    'icehockey_nhl': ([1.5], (5.5, 6.5), 0.5),
+    'americanfootball_nfl': ([1.5, 2.5, 3.5, 6.5, 7.5, 9.5], (37.5, 51.5), 1.0)
+}
+
+# Typical prop line per market; players get a line scattered around it
+PROP_LINES = {
+    'player_pass_yds': 235.5, 'player_pass_tds': 1.5, 'player_pass_completions': 21.5,
+    'player_rush_attempts': 13.5, 'player_receptions': 4.5, 'player_reception_yds': 48.5,
+    'player_points': 17.5, 'player_rebounds': 6.5, 'player_assists': 4.5,
+    'player_threes': 2.5, 'player_points_rebounds_assists': 28.5,
+    'player_shots_on_goal': 2.5, 'player_goals': 0.5
+}
+
+LINK_TEMPLATES = {
+    'BetMGM': "https://sports.{{state}}.betmgm.com/en/sports/event/{event}?market={market}&selection={outcome}",
+    'BetRivers': "https://{{state}}.betrivers.com/?page=sportsbook#event/{event}?betsource=direct&market={market}&outcome={outcome}",
+    'Caesars': "https://sportsbook.caesars.com/us/{{state}}/bet?id={event}&market={market}&selection={outcome}",
+    'DraftKings': "https://sportsbook.draftkings.com/{{state}}/event/{event}?category={market}&subcategory={outcome}",
+    'FanDuel': "https://sportsbook.fanduel.com/{{state}}/selection/{event}-{market}?btag={outcome}"
+}
+
+# Events per sport for typical slates, from a quiet night to a full college Saturday
+SLATES = {
+    'nhl_night': {'icehockey_nhl': 8},
+    'weeknight': {'basketball_nba': 10, 'icehockey_nhl': 12},
+    'nfl_sunday': {'americanfootball_nfl': 14, 'basketball_nba': 6, 'icehockey_nhl': 10},
+    'full_saturday': {
+        'americanfootball_ncaaf': 55, 'basketball_ncaab': 80,
+        'basketball_nba': 10, 'icehockey_nhl': 14
+    }
+}
+
+
+def sport_name(sport):
+    """Short sport name used to key OddsArbitrageFinder.player_props"""
+    return sport.upper().split('_')[1] if '_' in sport else sport.upper()
+
+
+class SyntheticOddsGenerator:
+    """
+    Deterministic Odds API payloads for benchmarks and offline runs.
+
+    Responses are shaped like /sports, /{sport}/events, /{sport}/odds and
+    /{sport}/events/{id}/odds. Every quote is derived from the seed, event,
+    book and market alone, so asking for the same thing twice (or through
+    a different endpoint) returns the same prices.
+
+    events_per_sport maps sport keys to event counts (see SLATES), books maps
+    regions to bookmaker titles, and alternate_lines/players set how many
+    alternate lines per side and players per team each book quotes.
+    """
+    def __init__(self, events_per_sport=None, books=None, alternate_lines=8, players=6,
+                 player_props=None, seed=0, start=None):
+        self.events_per_sport = dict(events_per_sport or SLATES['weeknight'])
+        self.books = books or REGION_BOOKS
+        self.alternate_lines = alternate_lines
+        self.players = players
+        self.player_props = player_props or {
+            'NFL': ['player_pass_yds', 'player_pass_tds', 'player_pass_completions',
+                    'player_rush_attempts', 'player_receptions', 'player_reception_yds'],
+            'NBA': ['player_points', 'player_rebounds', 'player_assists',
+                    'player_threes', 'player_points_rebounds_assists'],
+            'NHL': ['player_points', 'player_shots_on_goal', 'player_goals', 'player_assists']
+        }
+        self.seed = seed
+        self.start = start or datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+        self.event_cache = {}
+
+    def rng(self, *key):
+        # String seeds hash deterministically, independent of PYTHONHASHSEED
+        return random.Random(':'.join(str(part) for part in (self.seed,) + key))
+
+    def region_books(self, regions):
+        titles = []
+        for region in regions.split(','):
+            titles.extend(title for title in self.books.get(region.strip(), []) if title not in titles)
+        return titles
+
+    def sports(self):
+        """Payload for /sports"""
+        return [
+            {'key': sport, 'group': SPORT_TITLES.get(sport, sport), 'title': SPORT_TITLES.get(sport, sport),
+             'description': SPORT_TITLES.get(sport, sport), 'active': count > 0, 'has_outrights': False}
+            for sport, count in self.events_per_sport.items()
+        ]
+
+    def events(self, sport):
+        """Payload for /{sport}/events"""
+        if sport not in self.event_cache:
+            title = SPORT_TITLES.get(sport, sport)
+            self.event_cache[sport] = [
+                {
+                    'id': f"{sport}-{index:04d}",
+                    'sport_key': sport,
+                    'sport_title': title,
+                    'commence_time': (self.start + timedelta(minutes=30 * index)).strftime('%Y-%m-%dT%H:%M:%SZ'),
+                    'home_team': f"{title} Home {index}",
+                    'away_team': f"{title} Away {index}"
+                }
+                for index in range(self.events_per_sport.get(sport, 0))
+            ]
+        return self.event_cache[sport]
+
+    def get_event(self, sport, event_id):
+        for event in self.events(sport):
+            if event['id'] == event_id:
+                return event
+        return None
+
+    def price(self, rng, prob, book, market):
+        """Decimal price for a fair probability after the book's margin and a little noise"""
+        margin = 1.025 if book == 'Pinnacle' else rng.uniform(1.045, 1.075)
+        if market not in ('h2h', 'spreads', 'totals'):
+            margin += 0.025  # Alternates and props carry more vig than the main lines
+        if book != 'Pinnacle' and rng.random() < 0.03:
+            margin -= 0.1  # An occasional stale line, the source of real +EV and arbitrage
+        prob = min(max(prob * margin + rng.gauss(0, 0.01), 0.02), 0.98)
+        return round(1 / prob, 2)
+
+    def outcome(self, rng, event, book, market, name, prob, point=None, description=None):
+        outcome = {'name': name, 'price': self.price(rng, prob, book, market)}
+        if point is not None:
+            outcome['point'] = point
+        if description is not None:
+            outcome['description'] = description
+        template = LINK_TEMPLATES.get(book)
+        if template:
+            outcome['link'] = template.format(event=zlib.crc32(event['id'].encode()) % 10 ** 7,
+                                              market=rng.randrange(10 ** 6), outcome=rng.randrange(10 ** 8))
+        return outcome
+
+    def game_lines(self, event):
+        """Fair home win probability, main spread and main total shared by every book"""
+        spreads, (total_low, total_high), step = SPORT_LINES.get(event['sport_key'], ([3.5], (40.5, 50.5), 1.0))
+        rng = self.rng(event['id'], 'lines')
+        home_prob = rng.uniform(0.2, 0.8)
+        spread = rng.choice(spreads) * (1 if home_prob < 0.5 else -1)
+        total = total_low + step * rng.randrange(int((total_high - total_low) / step) + 1)
+        return home_prob, spread, total, step
+
+    def market(self, event, book, key):
+        """One bookmaker's market for an event, or None if the book does not offer it"""
+        rng = self.rng(event['id'], book, key)
+        home, away = event['home_team'], event['away_team']
+        home_prob, spread, total, step = self.game_lines(event)
+        outcomes = []
+
+        if key == 'h2h':
+            outcomes = [self.outcome(rng, event, book, key, home, home_prob),
+                        self.outcome(rng, event, book, key, away, 1 - home_prob)]
+        elif key == 'spreads':
+            outcomes = [self.outcome(rng, event, book, key, home, 0.5, spread),
+                        self.outcome(rng, event, book, key, away, 0.5, -spread)]
+        elif key == 'totals':
+            outcomes = [self.outcome(rng, event, book, key, 'Over', 0.5, total),
+                        self.outcome(rng, event, book, key, 'Under', 0.5, total)]
+        elif key in ('alternate_spreads', 'alternate_totals'):
+            for offset in range(-self.alternate_lines, self.alternate_lines + 1):
+                if offset == 0:
+                    continue
+                # Each step moves the line by roughly 3% of win probability
+                shift = min(max(0.5 + 0.03 * offset, 0.05), 0.95)
+                if key == 'alternate_spreads':
+                    point = spread + step * offset
+                    outcomes += [self.outcome(rng, event, book, key, home, shift, point),
+                                 self.outcome(rng, event, book, key, away, 1 - shift, -point)]
+                else:
+                    point = total + step * offset
+                    outcomes += [self.outcome(rng, event, book, key, 'Over', 1 - shift, point),
+                                 self.outcome(rng, event, book, key, 'Under', shift, point)]
+        elif key in PROP_LINES:
+            for team in (home, away):
+                for player in range(self.players):
+                    name = f"{team} Player {player}"
+                    base = self.rng(event['id'], name, key)
+                    line = max(PROP_LINES[key] + base.randrange(-4, 5) * (0.5 if PROP_LINES[key] < 5 else 2.5), 0.5)
+                    if rng.random() < 0.15:
+                        line += 0.5 if rng.random() < 0.5 else -0.5
+                        line = max(line, 0.5)
+                    over_prob = base.uniform(0.4, 0.6)
+                    outcomes += [self.outcome(rng, event, book, key, 'Over', over_prob, line, name),
+                                 self.outcome(rng, event, book, key, 'Under', 1 - over_prob, line, name)]
+
+        if not outcomes:
+            return None
+        return {'key': key, 'last_update': event['commence_time'], 'outcomes': outcomes}
+
+    def bookmakers(self, event, regions, markets):
+        bookmakers = []
+        for book in self.region_books(regions):
+            book_markets = [market for market in (self.market(event, book, key) for key in markets) if market]
+            if book_markets:
+                bookmakers.append({
+                    'key': book.lower(), 'title': book, 'last_update': event['commence_time'],
+                    'link': '', 'markets': book_markets
+                })
+        return bookmakers
+
+    def odds(self, sport, regions='us', markets='h2h,spreads,totals'):
+        """Payload for /{sport}/odds"""
+        markets = markets.split(',') if isinstance(markets, str) else markets
+        return [dict(event, bookmakers=self.bookmakers(event, regions, markets)) for event in self.events(sport)]
+
+    def event_odds(self, sport, event_id, regions='us', markets='alternate_spreads,alternate_totals'):
+        """Payload for /{sport}/events/{event_id}/odds, or None for an unknown event"""
+        event = self.get_event(sport, event_id)
+        if event is None:
+            return None
+        markets = markets.split(',') if isinstance(markets, str) else markets
+        prop_markets = set(self.player_props.get(sport_name(sport), []))
+        markets = [key for key in markets if not key.startswith('player_') or key in prop_markets]
+        return dict(event, bookmakers=self.bookmakers(event, regions, markets))
+
+    def slate(self, featured_markets=('h2h', 'spreads', 'totals'),
+              additional_markets=('alternate_spreads', 'alternate_totals')):
+        """
+        Every event as (sport, game, additional_odds, player_props), shaped like
+        the inputs OddsArbitrageFinder's detection passes receive after fetching
+        """
+        slate = []
+        all_regions = ','.join(self.books)
+        for sport in self.events_per_sport:
+            prop_markets = self.player_props.get(sport_name(sport), [])
+            for game in self.odds(sport, all_regions, list(featured_markets)):
+                additional_odds = self.event_odds(sport, game['id'], 'us', list(additional_markets))['bookmakers']
+                player_props = self.event_odds(sport, game['id'], all_regions, prop_markets)['bookmakers'] if prop_markets else []
+                slate.append((sport, game, additional_odds, player_props))
+        return slate
+
+
+def count_quotes(slate):
+    """Number of outcomes across every bookmaker and market in a slate"""
+    return sum(
+        len(market['outcomes'])
+        for _, game, additional_odds, player_props in slate
+        for bookmaker in game['bookmakers'] + additional_odds + player_props
+        for market in bookmaker['markets']
+    )